@@ -1,8 +1,10 @@
 """FastAPI application factory."""
+from typing import Any, Callable, Optional
+
 from fastapi import FastAPI
 
-def create_app() -> FastAPI:
-    """Create and configure FastAPI application."""
+def create_app(lifespan: Optional[Callable[[FastAPI], Any]] = None) -> FastAPI:
+    """Create and configure FastAPI application, with an optional lifespan handler."""
     # Import routes here to avoid circular imports
     from app.routes import health, ingest, query
 
@@ -11,7 +13,8 @@ def create_app() -> FastAPI:
         description="Retrieval-Augmented Generation API with PDF & Web Scraping",
         version="2.0.0",
         docs_url="/docs",
-        redoc_url="/redoc"
+        redoc_url="/redoc",
+        lifespan=lifespan
     )
 
     @app.get("/")
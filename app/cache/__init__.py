@@ -0,0 +1,4 @@
+"""Cache package."""
+from app.cache.redis_cache import RedisCache
+
+__all__ = ["RedisCache"]
@@ -0,0 +1,80 @@
+"""Redis cache for search results."""
+import json
+import logging
+from typing import Any, Optional
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCache:
+    """Async Redis cache with TTL expiry and pattern invalidation."""
+
+    def __init__(self, url: str, default_ttl: int = 300):
+        """
+        Initialize Redis client.
+
+        Args:
+            url: Redis connection URL
+            default_ttl: Expiry in seconds for keys set without an explicit TTL
+        """
+        self.client = redis.from_url(url)
+        self.default_ttl = default_ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Decoded value, or None on miss or Redis error
+        """
+        try:
+            value = await self.client.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Redis GET failed for '{key}': {e}")
+            return None
+
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Cache a JSON-serializable value with expiry.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Expiry in seconds (default: default_ttl)
+        """
+        try:
+            await self.client.setex(key, ttl or self.default_ttl, json.dumps(value))
+        except Exception as e:
+            logger.warning(f"⚠️ Redis SETEX failed for '{key}': {e}")
+
+    async def invalidate(self, pattern: str) -> int:
+        """
+        Delete all keys matching a glob pattern.
+
+        Args:
+            pattern: Redis MATCH pattern, e.g. 'memory:documents:*'
+
+        Returns:
+            Number of keys deleted
+        """
+        try:
+            keys = [key async for key in self.client.scan_iter(match=pattern, count=500)]
+            if not keys:
+                return 0
+            deleted = await self.client.delete(*keys)
+            logger.debug(f"🧹 Invalidated {deleted} cache keys matching '{pattern}'")
+            return deleted
+        except Exception as e:
+            logger.warning(f"⚠️ Redis invalidation failed for '{pattern}': {e}")
+            return 0
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self.client.aclose()
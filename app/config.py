@@ -1,5 +1,6 @@
 """Configuration management using Pydantic Settings."""
 import os
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -23,8 +24,9 @@ class Settings(BaseSettings):
     db_password: str = Field(default="postgres", alias="DB_PASSWORD")
     db_host: str = Field(default="localhost", alias="DB_HOST")
     db_port: int = Field(default=5432, alias="DB_PORT")
-    db_min_conn: int = Field(default=1, alias="DB_MIN_CONN")
-    db_max_conn: int = Field(default=10, alias="DB_MAX_CONN")
+    db_min_conn: int = Field(default=10, alias="DB_MIN_CONN")
+    db_max_conn: int = Field(default=50, alias="DB_MAX_CONN")
+    db_prepare_statements: bool = Field(default=True, alias="DB_PREPARE_STATEMENTS")
 
     # OpenAI
     openai_api_key: str = Field(default="", alias="OPENAI_API_KEY")
@@ -37,6 +39,22 @@ class Settings(BaseSettings):
     default_top_k: int = Field(default=4, alias="DEFAULT_TOP_K")
     max_top_k: int = Field(default=20, alias="MAX_TOP_K")
     vector_dim: int = Field(default=1536, alias="VECTOR_DIM")
+    hnsw_ef_search: int = Field(default=100, alias="HNSW_EF_SEARCH")
+    defer_index_build: bool = Field(default=False, alias="DEFER_INDEX_BUILD")
+    binary_quantize: bool = Field(default=False, alias="BINARY_QUANTIZE")
+    rerank_candidates: int = Field(default=200, alias="RERANK_CANDIDATES")
+    keyword_search: bool = Field(default=False, alias="KEYWORD_SEARCH")
+
+    # Embeddings
+    embedding_batch_poll_interval: float = Field(default=30.0, alias="EMBEDDING_BATCH_POLL_INTERVAL")
+
+    # Search batching (concurrent queries sharing one embedding call)
+    search_batch_size: int = Field(default=16, alias="SEARCH_BATCH_SIZE")
+    search_batch_wait: float = Field(default=0.05, alias="SEARCH_BATCH_WAIT")
+
+    # Redis (search result cache; disabled when empty)
+    redis_url: str = Field(default="", alias="REDIS_URL")
+    search_cache_ttl: int = Field(default=300, alias="SEARCH_CACHE_TTL")
 
     # Web Scraping
     web_timeout: int = Field(default=10, alias="WEB_TIMEOUT")
@@ -49,11 +67,11 @@ class Settings(BaseSettings):
         case_sensitive = False
         extra = "allow"  # Allow extra fields
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once and return the cached instance."""
+    return Settings()
+
+
 # ✅ Create global settings instance
-try:
-    settings = Settings()
-    print("✅ Settings loaded successfully")
-except Exception as e:
-    print(f"❌ Error loading settings: {e}")
-    # Use defaults if .env doesn't exist
-    settings = Settings()
\ No newline at end of file
+settings = get_settings()
@@ -1,13 +1,73 @@
 """PostgreSQL Vector Database Connection."""
-import psycopg2
-from psycopg2.extras import execute_values
-from psycopg2 import pool
+import psycopg
+from psycopg.conninfo import make_conninfo
+from psycopg.types.json import set_json_loads
+from psycopg_pool import AsyncConnectionPool
+from pgvector.psycopg import register_vector_async
+import numpy as np
 import logging
-from typing import List, Dict, Any, Tuple
-import json
+from typing import List, Dict, Any, Optional, Tuple
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# HNSW index defaults used when a table is first created
+HNSW_M = 24
+HNSW_EF_CONSTRUCTION = 128
+HNSW_EF_SEARCH = 100
+
+# Characters of each match returned as its source snippet
+SNIPPET_LENGTH = 300
+
+# Candidates fetched by the binary-quantized first stage before float rerank
+RERANK_CANDIDATES = 200
+
+# Tracks OpenAI Batch API embedding jobs so ingests can resume after a restart
+BATCH_JOBS_TABLE = "embedding_batch_jobs"
+
+# Text search configuration used by keyword search and its index
+TEXT_SEARCH_CONFIG = "english"
+
+# Session settings applied while building an index
+MAINTENANCE_WORK_MEM = "2GB"
+MAX_PARALLEL_MAINTENANCE_WORKERS = 7
+
+
+def configure_hnsw_params(vector_count: int) -> Dict[str, int]:
+    """
+    Pick HNSW build parameters for a table of the given size.
+
+    Query-time ef_search is not sized here: it always comes from the
+    HNSW_EF_SEARCH setting, so search behaves the same before and after a
+    restart.
+
+    Args:
+        vector_count: Number of vectors stored in the table
+
+    Returns:
+        Dictionary with m and ef_construction
+    """
+    if vector_count < 100_000:
+        return {"m": 16, "ef_construction": 64}
+    if vector_count < 1_000_000:
+        return {"m": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION}
+    return {"m": 32, "ef_construction": 256}
+
+
+def _copy_value(value: Any) -> Any:
+    """
+    Prepare a single value for COPY.
+
+    Lists and numpy arrays become pgvector literals; everything else is
+    left for psycopg to escape.
+    """
+    if isinstance(value, np.ndarray):
+        # Formatted by numpy rather than per-float Python repr
+        return "[" + ",".join(np.char.mod("%.7g", value)) + "]"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(map(repr, value)) + "]"
+    return value
+
 
 class PostgresVdbClient:
     """PostgreSQL Vector Database Client with pgvector support."""
@@ -21,10 +81,14 @@ class PostgresVdbClient:
             host: str = "localhost",
             port: int = 5432,
             min_conn: int = 1,
-            max_conn: int = 10
+            max_conn: int = 10,
+            hnsw_ef_search: int = HNSW_EF_SEARCH,
+            binary_quantize: bool = False,
+            rerank_candidates: int = RERANK_CANDIDATES,
+            prepare_statements: bool = True
     ):
         """
-        Initialize PostgreSQL connection pool.
+        Initialize PostgreSQL connection pool (opened by open()).
 
         Args:
             engine_name: Name of the engine (for logging)
@@ -35,94 +99,256 @@ class PostgresVdbClient:
             port: Database port
             min_conn: Minimum connections in pool
             max_conn: Maximum connections in pool
+            hnsw_ef_search: HNSW candidate list size used by every search
+            binary_quantize: Search a bit-quantized HNSW index first, then
+                rerank its candidates by full-precision cosine distance
+            rerank_candidates: Candidates taken from the quantized index
+            prepare_statements: Use server-side prepared statements; disable
+                behind a transaction-pooling PgBouncer older than 1.21
         """
         self.engine_name = engine_name
-
+        self.hnsw_ef_search = hnsw_ef_search
+        self.binary_quantize = binary_quantize
+        self.prepare_statements = prepare_statements
+        self.rerank_candidates = rerank_candidates
+        # Embedding dimension per table, needed for the bit(n) index expression
+        self._vector_dims: Dict[str, int] = {}
+
+        self.conninfo = make_conninfo(
+            dbname=dbname,
+            user=user,
+            password=password,
+            host=host,
+            port=port,
+            # Identifies this client's backends in pg_stat_activity
+            application_name=f"rag-{engine_name}"
+        )
+        self.pool = AsyncConnectionPool(
+            self.conninfo,
+            min_size=min_conn,
+            max_size=max_conn,
+            configure=self._configure_connection,
+            # Also turns off psycopg's automatic preparation of repeated queries
+            kwargs={} if prepare_statements else {"prepare_threshold": None},
+            open=False
+        )
+
+    async def open(self):
+        """Enable pgvector, then open the connection pool (no-op if already open)."""
+        if not self.pool.closed:
+            return
         try:
-            # Create connection pool
-            self.pool = psycopg2.pool.SimpleConnectionPool(
-                min_conn,
-                max_conn,
-                dbname=dbname,
-                user=user,
-                password=password,
-                host=host,
-                port=port
-            )
-            logger.info(f"✅ PostgreSQL connection pool created for {engine_name}")
-
-            # Enable pgvector extension
-            self._enable_pgvector()
-
+            # Pooled connections register the vector types, so the
+            # extension has to exist before the first one is made
+            await self._enable_pgvector()
+            await self.pool.open(wait=True)
+            logger.info(f"✅ PostgreSQL connection pool created for {self.engine_name}")
         except Exception as e:
             logger.error(f"❌ Failed to create connection pool: {e}", exc_info=True)
             raise
 
-    def _get_connection(self):
-        """Get connection from pool."""
-        return self.pool.getconn()
-
-    def _return_connection(self, conn):
-        """Return connection to pool."""
-        self.pool.putconn(conn)
+    async def _configure_connection(self, conn: psycopg.AsyncConnection):
+        """Register pgvector types and the JSONB loader on each new pooled connection."""
+        await register_vector_async(conn)
+        # JSONB columns arrive as dicts; orjson does the remaining parse
+        set_json_loads(orjson.loads, conn)
+        await conn.commit()
 
-    def _enable_pgvector(self):
+    async def _enable_pgvector(self):
         """Enable pgvector extension."""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute("CREATE EXTENSION IF NOT EXISTS vector;")
-            conn.commit()
+            async with await psycopg.AsyncConnection.connect(self.conninfo, autocommit=True) as conn:
+                await conn.execute("CREATE EXTENSION IF NOT EXISTS vector;")
 
             logger.info("✅ pgvector extension enabled")
-
-            cursor.close()
-            self._return_connection(conn)
         except Exception as e:
             logger.warning(f"⚠️ Could not enable pgvector: {e}")
-            self._return_connection(conn)
 
-    def create_table(self, table_name: str, vector_dim: int = 1536):
+    async def _set_index_build_params(self, cursor):
+        """Raise memory and parallelism for index builds in the current transaction."""
+        await cursor.execute(f"SET LOCAL maintenance_work_mem = '{MAINTENANCE_WORK_MEM}';")
+        await cursor.execute(f"SET LOCAL max_parallel_maintenance_workers = {MAX_PARALLEL_MAINTENANCE_WORKERS};")
+
+    async def _create_index(self, cursor, table_name: str, m: int, ef_construction: int):
+        """Create the HNSW cosine index on the halfvec embedding column (plus the bit index if enabled)."""
+        await self._set_index_build_params(cursor)
+        await cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS {table_name}_embedding_idx
+        ON {table_name}
+        USING hnsw (embedding halfvec_cosine_ops)
+        WITH (m = {m}, ef_construction = {ef_construction});
+        """)
+        if self.binary_quantize:
+            # Expression index: the 1 bit/dimension copy lives only in the index
+            dim = self._vector_dims[table_name]
+            await cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS {table_name}_embedding_bq_idx
+            ON {table_name}
+            USING hnsw ((binary_quantize(embedding)::bit({dim})) bit_hamming_ops)
+            WITH (m = {m}, ef_construction = {ef_construction});
+            """)
+
+    async def _migrate_to_halfvec(self, cursor, table_name: str, vector_dim: int):
+        """Convert a legacy vector(n) embedding column to halfvec(n) in place."""
+        await cursor.execute("""
+        SELECT format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = %s::regclass AND attname = 'embedding';
+        """, (table_name,))
+        row = await cursor.fetchone()
+        if row is None or not row[0].startswith("vector("):
+            return
+
+        # The old index uses vector_cosine_ops, which does not apply to halfvec
+        await cursor.execute(f"DROP INDEX IF EXISTS {table_name}_embedding_idx;")
+        await cursor.execute(f"""
+        ALTER TABLE {table_name}
+        ALTER COLUMN embedding TYPE halfvec({vector_dim})
+        USING embedding::halfvec({vector_dim});
+        """)
+        logger.info(f"✅ Migrated '{table_name}'.embedding from {row[0]} to halfvec({vector_dim})")
+
+    async def create_table(self, table_name: str, vector_dim: int = 1536, create_index: bool = True):
         """
         Create vector table if it doesn't exist.
 
         Args:
             table_name: Name of the table
             vector_dim: Dimension of embedding vectors (default: 1536 for OpenAI)
+            create_index: Build the HNSW index now; pass False to defer it
+                to finalize_index() after the initial bulk load
         """
+        self._vector_dims[table_name] = vector_dim
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            async with self.pool.connection() as conn:
+                async with conn.cursor() as cursor:
+                    sql = f"""
+                    CREATE TABLE IF NOT EXISTS {table_name} (
+                        id TEXT PRIMARY KEY,
+                        text TEXT NOT NULL,
+                        embedding halfvec({vector_dim}),
+                        metadata JSONB DEFAULT '{{}}',
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    );
+                    """
+
+                    await cursor.execute(sql)
+                    await self._migrate_to_halfvec(cursor, table_name, vector_dim)
+                    if create_index:
+                        await self._create_index(cursor, table_name, HNSW_M, HNSW_EF_CONSTRUCTION)
 
-            sql = f"""
-            CREATE TABLE IF NOT EXISTS {table_name} (
-                id TEXT PRIMARY KEY,
-                text TEXT NOT NULL,
-                embedding vector({vector_dim}),
-                metadata JSONB DEFAULT '{{}}',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE INDEX IF NOT EXISTS {table_name}_embedding_idx 
-            ON {table_name} 
-            USING ivfflat (embedding vector_cosine_ops)
-            WITH (lists = 100);
-            """
+            logger.info(f"✅ Table '{table_name}' created/verified with vector dimension {vector_dim}")
+        except Exception as e:
+            logger.error(f"❌ Error creating table '{table_name}': {e}", exc_info=True)
+            raise
 
-            cursor.execute(sql)
-            conn.commit()
+    async def finalize_index(self, table_name: str) -> bool:
+        """
+        Build the HNSW indexes that don't exist yet.
 
-            logger.info(f"✅ Table '{table_name}' created/verified with vector dimension {vector_dim}")
+        Intended to run once after an initial bulk load, so rows are not
+        paying per-insert index maintenance. Parameters are sized to the
+        loaded row count. The binary quantized index is checked too, so
+        enabling BINARY_QUANTIZE on an existing table builds it here.
+
+        Args:
+            table_name: Name of the table
+
+        Returns:
+            True if an index was built, False if all of them already existed
+        """
+        index_names = [f"{table_name}_embedding_idx"]
+        if self.binary_quantize:
+            index_names.append(f"{table_name}_embedding_bq_idx")
+
+        try:
+            async with self.pool.connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        "SELECT bool_and(to_regclass(name) IS NOT NULL) FROM unnest(%s::text[]) AS name;",
+                        (index_names,)
+                    )
+                    if (await cursor.fetchone())[0]:
+                        return False
+
+                    await cursor.execute(f"SELECT count(*) FROM {table_name};")
+                    params = configure_hnsw_params((await cursor.fetchone())[0])
+
+                    await self._create_index(cursor, table_name, params["m"], params["ef_construction"])
 
-            cursor.close()
-            self._return_connection(conn)
+            logger.info(f"✅ Built HNSW index on '{table_name}' with {params}")
+
+            return True
         except Exception as e:
-            logger.error(f"❌ Error creating table '{table_name}': {e}", exc_info=True)
-            self._return_connection(conn)
+            logger.error(f"❌ Error building index on '{table_name}': {e}", exc_info=True)
             raise
 
-    def batch_exists_check(self, table_name: str, ids: List[str]) -> Dict[str, bool]:
+    async def create_batch_jobs_table(self):
+        """Create the embedding batch job table if it doesn't exist."""
+        try:
+            async with self.pool.connection() as conn:
+                await conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {BATCH_JOBS_TABLE} (
+                    job_key TEXT PRIMARY KEY,
+                    batch_id TEXT NOT NULL,
+                    table_name TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                """)
+        except Exception as e:
+            logger.error(f"❌ Error creating table '{BATCH_JOBS_TABLE}': {e}", exc_info=True)
+            raise
+
+    async def get_batch_job(self, job_key: str) -> Optional[Dict[str, str]]:
+        """
+        Look up a recorded embedding batch job.
+
+        Args:
+            job_key: Key identifying the set of items being embedded
+
+        Returns:
+            Dictionary with batch_id and status, or None if not recorded
+        """
+        try:
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(
+                    f"SELECT batch_id, status FROM {BATCH_JOBS_TABLE} WHERE job_key = %s;",
+                    (job_key,)
+                )
+                row = await cursor.fetchone()
+
+            return {"batch_id": row[0], "status": row[1]} if row else None
+        except Exception as e:
+            logger.error(f"❌ Error reading batch job {job_key}: {e}", exc_info=True)
+            return None
+
+    async def save_batch_job(self, job_key: str, batch_id: str, table_name: str, status: str):
+        """
+        Insert or update an embedding batch job record.
+
+        Args:
+            job_key: Key identifying the set of items being embedded
+            batch_id: OpenAI batch ID
+            table_name: Table the embeddings are destined for
+            status: pending, completed or failed
+        """
+        try:
+            async with self.pool.connection() as conn:
+                await conn.execute(f"""
+                INSERT INTO {BATCH_JOBS_TABLE} (job_key, batch_id, table_name, status)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (job_key) DO UPDATE
+                SET batch_id = EXCLUDED.batch_id,
+                    status = EXCLUDED.status,
+                    updated_at = CURRENT_TIMESTAMP;
+                """, (job_key, batch_id, table_name, status))
+        except Exception as e:
+            logger.error(f"❌ Error saving batch job {job_key}: {e}", exc_info=True)
+            raise
+
+    async def batch_exists_check(self, table_name: str, ids: List[str]) -> Dict[str, bool]:
         """
         Check which IDs already exist in table.
 
@@ -137,28 +363,83 @@ class PostgresVdbClient:
             return {}
 
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # Create placeholders
-            placeholders = ','.join(['%s'] * len(ids))
-            sql = f"SELECT id FROM {table_name} WHERE id IN ({placeholders});"
-
-            cursor.execute(sql, ids)
-            existing_ids = {row[0] for row in cursor.fetchall()}
+            # One plan for every batch size, so a single prepared statement
+            sql = f"SELECT id FROM {table_name} WHERE id = ANY(%s);"
 
-            result = {id: id in existing_ids for id in ids}
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(sql, (ids,), prepare=self.prepare_statements)
+                existing_ids = {row[0] for row in await cursor.fetchall()}
 
-            cursor.close()
-            self._return_connection(conn)
-
-            return result
+            return {id: id in existing_ids for id in ids}
         except Exception as e:
             logger.error(f"❌ Error checking IDs: {e}", exc_info=True)
-            self._return_connection(conn)
             return {id: False for id in ids}
 
-    def batch_insert(
+    async def get_ids_and_texts(
+            self,
+            table_name: str,
+            id_length: int,
+            after: str = "",
+            limit: int = 1000
+    ) -> List[Tuple[str, str]]:
+        """
+        Page through rows whose ID has the given length, in ID order.
+
+        Args:
+            table_name: Name of the table
+            id_length: Length of the IDs to return
+            after: Return only IDs sorting after this one (keyset pagination)
+            limit: Most rows to return
+
+        Returns:
+            (id, text) pairs
+        """
+        sql = f"""
+        SELECT id, text FROM {table_name}
+        WHERE id > %s AND length(id) = %s
+        ORDER BY id
+        LIMIT %s;
+        """
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(sql, (after, id_length, limit))
+            return await cursor.fetchall()
+
+    async def rekey_rows(self, table_name: str, id_pairs: List[Tuple[str, str]]) -> int:
+        """
+        Change row IDs in one transaction.
+
+        A row whose new ID is already taken (the same text ingested again
+        under the new ID) is a duplicate and is deleted instead.
+
+        Args:
+            table_name: Name of the table
+            id_pairs: (old_id, new_id) pairs
+
+        Returns:
+            Number of rows re-keyed or deleted
+        """
+        if not id_pairs:
+            return 0
+
+        old_ids = [old_id for old_id, _ in id_pairs]
+        new_ids = [new_id for _, new_id in id_pairs]
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(f"""
+                DELETE FROM {table_name} AS old
+                USING unnest(%s::text[], %s::text[]) AS pairs(old_id, new_id)
+                WHERE old.id = pairs.old_id
+                  AND EXISTS (SELECT 1 FROM {table_name} WHERE id = pairs.new_id);
+                """, (old_ids, new_ids))
+                deleted = cursor.rowcount
+                await cursor.execute(f"""
+                UPDATE {table_name} SET id = pairs.new_id
+                FROM unnest(%s::text[], %s::text[]) AS pairs(old_id, new_id)
+                WHERE {table_name}.id = pairs.old_id;
+                """, (old_ids, new_ids))
+                return deleted + cursor.rowcount
+
+    async def batch_insert(
             self,
             table_name: str,
             columns: List[str],
@@ -167,6 +448,9 @@ class PostgresVdbClient:
         """
         Batch insert data into table.
 
+        Rows are streamed with COPY into a temporary staging table and then
+        moved over with INSERT ... SELECT, so duplicate IDs are still skipped.
+
         Args:
             table_name: Name of the table
             columns: List of column names
@@ -179,31 +463,31 @@ class PostgresVdbClient:
             return 0
 
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # Build INSERT statement
             col_names = ', '.join(columns)
-            placeholders = ', '.join(['%s'] * len(columns))
-            sql = f"INSERT INTO {table_name} ({col_names}) VALUES ({placeholders}) ON CONFLICT (id) DO NOTHING;"
-
-            # Execute batch insert
-            execute_values(cursor, sql, data, page_size=1000)
-            conn.commit()
-
-            rows_inserted = cursor.rowcount
-            logger.info(f"✅ Inserted {rows_inserted} rows into '{table_name}'")
-
-            cursor.close()
-            self._return_connection(conn)
+            staging = f"{table_name}_staging"
+
+            async with self.pool.connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        f"CREATE TEMP TABLE {staging} (LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP;"
+                    )
+                    async with cursor.copy(f"COPY {staging} ({col_names}) FROM STDIN;") as copy:
+                        for row in data:
+                            await copy.write_row([_copy_value(v) for v in row])
+                    await cursor.execute(
+                        f"INSERT INTO {table_name} ({col_names}) "
+                        f"SELECT {col_names} FROM {staging} ON CONFLICT (id) DO NOTHING;"
+                    )
+                    rows_inserted = cursor.rowcount
+
+            logger.info("✅ Inserted %s rows into '%s'", rows_inserted, table_name)
 
             return rows_inserted
         except Exception as e:
             logger.error(f"❌ Error inserting data: {e}", exc_info=True)
-            self._return_connection(conn)
             raise
 
-    def search(
+    async def search(
             self,
             table_name: str,
             query_embedding: List[float],
@@ -223,47 +507,260 @@ class PostgresVdbClient:
             List of matching documents with similarity scores
         """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            # Adapted by pgvector; cast to halfvec server-side
+            embedding = np.asarray(query_embedding, dtype=np.float32)
+
+            async with self.pool.connection() as conn:
+                # Pipelined, so the settings and the query share one round trip
+                async with conn.pipeline():
+                    async with conn.cursor() as cursor:
+                        await self._set_search_params(cursor)
+                        # Prepared on first use per connection, skipping parse/plan afterwards
+                        await cursor.execute(
+                            self._search_sql(table_name),
+                            self._search_params(embedding, limit, threshold),
+                            prepare=self.prepare_statements
+                        )
+                        results = await cursor.fetchall()
+
+            formatted_results = self._format_search_rows(results)
+            logger.debug("✅ Search found %s results", len(formatted_results))
 
-            # Convert embedding to pgvector format
-            embedding_str = '[' + ','.join(str(x) for x in query_embedding) + ']'
+            return formatted_results
+        except Exception as e:
+            logger.error(f"❌ Error searching: {e}", exc_info=True)
+            return []
 
-            sql = f"""
-            SELECT id, text, metadata, 
-                   1 - (embedding <=> %s::vector) as similarity
-            FROM {table_name}
-            WHERE 1 - (embedding <=> %s::vector) > %s
-            ORDER BY embedding <=> %s::vector
-            LIMIT %s;
-            """
+    async def create_keyword_index(self, table_name: str):
+        """
+        Create the full-text (GIN) index used by keyword_search if it doesn't exist.
 
-            cursor.execute(sql, (embedding_str, embedding_str, threshold, embedding_str, limit))
-            results = cursor.fetchall()
+        Args:
+            table_name: Name of the table
+        """
+        try:
+            async with self.pool.connection() as conn:
+                await conn.execute(f"""
+                CREATE INDEX IF NOT EXISTS {table_name}_text_fts_idx
+                ON {table_name} USING gin (to_tsvector('{TEXT_SEARCH_CONFIG}', text));
+                """)
+            logger.info(f"✅ Keyword index on '{table_name}' created/verified")
+        except Exception as e:
+            logger.error(f"❌ Error creating keyword index on '{table_name}': {e}", exc_info=True)
+            raise
 
-            # Format results
-            formatted_results = [
-                {
-                    "id": row[0],
-                    "text": row[1],
-                    "metadata": json.loads(row[2]) if row[2] else {},
-                    "similarity": float(row[3])
-                }
-                for row in results
-            ]
+    async def keyword_search(self, table_name: str, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Full-text search ranked by ts_rank_cd.
 
-            logger.debug(f"✅ Search found {len(formatted_results)} results")
+        Args:
+            table_name: Name of the table
+            query: Search text in web search syntax (quotes, OR, -word)
+            limit: Number of results to return
 
-            cursor.close()
-            self._return_connection(conn)
+        Returns:
+            List of matching documents with their rank
 
-            return formatted_results
-        except Exception as e:
-            logger.error(f"❌ Error searching: {e}", exc_info=True)
-            self._return_connection(conn)
-            return []
+        Raises:
+            Exception: If the query fails
+        """
+        sql = f"""
+        SELECT id, text, metadata, ts_rank_cd(to_tsvector('{TEXT_SEARCH_CONFIG}', text), query) AS rank
+        FROM {table_name}, websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', %(query)s) AS query
+        WHERE to_tsvector('{TEXT_SEARCH_CONFIG}', text) @@ query
+        ORDER BY rank DESC
+        LIMIT %(limit)s;
+        """
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(
+                sql, {"query": query, "limit": limit}, prepare=self.prepare_statements
+            )
+            rows = await cursor.fetchall()
+
+        logger.debug("✅ Keyword search found %s results", len(rows))
+        return [
+            {"id": row[0], "text": row[1], "metadata": row[2] or {}, "rank": float(row[3])}
+            for row in rows
+        ]
+
+    async def search_many(
+            self,
+            table_name: str,
+            query_embeddings: List[List[float]],
+            limits: List[int],
+            threshold: float = 0.0
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several searches over one connection in pipeline mode.
+
+        All queries are sent before any result is read, so a batch costs
+        one round trip instead of one per query.
+
+        Args:
+            table_name: Name of the table
+            query_embeddings: One query embedding per search
+            limits: Number of results to return for each search
+            threshold: Minimum similarity threshold
+
+        Returns:
+            One list of matching documents per query, in input order
+
+        Raises:
+            Exception: If the pipeline fails; every query in it fails together
+        """
+        sql = self._search_sql(table_name)
+
+        async with self.pool.connection() as conn:
+            cursors = []
+            async with conn.pipeline():
+                async with conn.cursor() as cursor:
+                    await self._set_search_params(cursor)
+                for query_embedding, limit in zip(query_embeddings, limits):
+                    cursor = conn.cursor()
+                    embedding = np.asarray(query_embedding, dtype=np.float32)
+                    await cursor.execute(
+                        sql,
+                        self._search_params(embedding, limit, threshold),
+                        prepare=self.prepare_statements
+                    )
+                    cursors.append(cursor)
+
+            results = []
+            for cursor in cursors:
+                results.append(self._format_search_rows(await cursor.fetchall()))
+                await cursor.close()
+
+        logger.debug("✅ Pipelined %s searches", len(results))
+        return results
+
+    async def search_context_many(
+            self,
+            table_name: str,
+            query_embeddings: List[List[float]],
+            params: List[Tuple[int, int]],
+            threshold: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Search and assemble the LLM context server-side for several queries.
+
+        The matching texts are joined by string_agg in distance order and the
+        per-source summaries built by json_agg, so each query's results arrive
+        as one row instead of one row per match. The statements run in
+        pipeline mode over one connection, like search_many.
+
+        Args:
+            table_name: Name of the table
+            query_embeddings: One query embedding per search
+            params: (limit, snippet_length) for each search; snippet_length is
+                the characters of each match kept in its source summary
+            threshold: Minimum similarity threshold
+
+        Returns:
+            One dictionary with context (str), sources (list of content/metadata)
+            and count per query, in input order
 
-    def get_all(self, table_name: str, limit: int = 100) -> List[Dict[str, Any]]:
+        Raises:
+            Exception: If the pipeline fails; every query in it fails together
+        """
+        hits_sql = self._search_sql(table_name).rstrip().rstrip(";")
+        sql = f"""
+        SELECT
+            string_agg(text, E'\\n\\n' ORDER BY distance),
+            json_agg(
+                json_build_object('content', left(text, %(snippet_length)s), 'metadata', metadata)
+                ORDER BY distance
+            ),
+            count(*)
+        FROM ({hits_sql}) AS hits;
+        """
+
+        async with self.pool.connection() as conn:
+            cursors = []
+            async with conn.pipeline():
+                async with conn.cursor() as cursor:
+                    await self._set_search_params(cursor)
+                for query_embedding, (limit, snippet_length) in zip(query_embeddings, params):
+                    cursor = conn.cursor()
+                    embedding = np.asarray(query_embedding, dtype=np.float32)
+                    query_params = self._search_params(embedding, limit, threshold)
+                    query_params["snippet_length"] = snippet_length
+                    await cursor.execute(sql, query_params, prepare=self.prepare_statements)
+                    cursors.append(cursor)
+
+            results = []
+            for cursor in cursors:
+                row = await cursor.fetchone()
+                results.append({"context": row[0] or "", "sources": row[1] or [], "count": row[2]})
+                await cursor.close()
+
+        logger.debug("✅ Pipelined %s context searches", len(results))
+        return results
+
+    async def _set_search_params(self, cursor):
+        """Apply per-transaction planner settings for a vector search."""
+        ef_search = self.hnsw_ef_search
+        if self.binary_quantize:
+            # An HNSW scan returns at most ef_search rows
+            ef_search = max(ef_search, self.rerank_candidates)
+        # Bitmap scans lose the HNSW index ordering and rescan the heap, so
+        # keep the planner on the index scan. Transaction-local, so pooled
+        # connections stay clean.
+        await cursor.execute(
+            "SELECT set_config('enable_bitmapscan', 'off', true), "
+            "set_config('hnsw.ef_search', %s, true);",
+            (str(ef_search),),
+            prepare=self.prepare_statements
+        )
+
+    def _search_sql(self, table_name: str) -> str:
+        """Build the nearest-neighbour query for a table."""
+        if self.binary_quantize:
+            # Hamming distance over the bit index picks candidates; only those
+            # are reranked by cosine distance on the stored halfvec
+            dim = self._vector_dims[table_name]
+            source = f"""(
+                SELECT id, text, metadata, embedding
+                FROM {table_name}
+                ORDER BY binary_quantize(embedding)::bit({dim}) <~> binary_quantize(%(embedding)s::halfvec)
+                LIMIT %(candidates)s
+            ) AS candidates"""
+        else:
+            source = table_name
+
+        # Distance is computed once, in the inner scan, which the HNSW index
+        # can stop at LIMIT; the outer query only filters on the alias
+        return f"""
+        SELECT id, text, metadata, distance
+        FROM (
+            SELECT id, text, metadata, embedding <=> %(embedding)s::halfvec AS distance
+            FROM {source}
+            ORDER BY distance
+            LIMIT %(limit)s
+        ) AS nearest
+        WHERE distance < %(max_distance)s;
+        """
+
+    def _search_params(self, embedding: np.ndarray, limit: int, threshold: float) -> Dict[str, Any]:
+        """Bind parameters for _search_sql."""
+        params = {"embedding": embedding, "limit": limit, "max_distance": 1 - threshold}
+        if self.binary_quantize:
+            params["candidates"] = max(self.rerank_candidates, limit)
+        return params
+
+    @staticmethod
+    def _format_search_rows(rows: List[Tuple]) -> List[Dict[str, Any]]:
+        """Convert search rows to result dicts."""
+        return [
+            {
+                "id": row[0],
+                "text": row[1],
+                "metadata": row[2] or {},
+                "similarity": 1 - float(row[3])
+            }
+            for row in rows
+        ]
+
+    async def get_all(self, table_name: str, limit: int = 100) -> List[Dict[str, Any]]:
         """
         Get all documents from table.
 
@@ -275,9 +772,6 @@ class PostgresVdbClient:
             List of documents
         """
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
             sql = f"""
             SELECT id, text, metadata, created_at
             FROM {table_name}
@@ -285,54 +779,45 @@ class PostgresVdbClient:
             LIMIT %s;
             """
 
-            cursor.execute(sql, (limit,))
-            results = cursor.fetchall()
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(sql, (limit,))
+                results = await cursor.fetchall()
 
             formatted_results = [
                 {
                     "id": row[0],
                     "text": row[1],
-                    "metadata": json.loads(row[2]) if row[2] else {},
+                    "metadata": row[2] or {},
                     "created_at": str(row[3])
                 }
                 for row in results
             ]
 
-            cursor.close()
-            self._return_connection(conn)
-
             return formatted_results
         except Exception as e:
             logger.error(f"❌ Error fetching all: {e}", exc_info=True)
-            self._return_connection(conn)
             return []
 
-    def delete_by_id(self, table_name: str, id: str) -> bool:
+    async def delete_by_id(self, table_name: str, id: str) -> bool:
         """Delete document by ID."""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
             sql = f"DELETE FROM {table_name} WHERE id = %s;"
-            cursor.execute(sql, (id,))
-            conn.commit()
 
-            deleted = cursor.rowcount > 0
-            logger.info(f"✅ Deleted document: {id}")
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(sql, (id,))
+                deleted = cursor.rowcount > 0
 
-            cursor.close()
-            self._return_connection(conn)
+            logger.info(f"✅ Deleted document: {id}")
 
             return deleted
         except Exception as e:
             logger.error(f"❌ Error deleting: {e}", exc_info=True)
-            self._return_connection(conn)
             return False
 
-    def close(self):
+    async def close(self):
         """Close all connections in pool."""
         try:
-            self.pool.closeall()
+            await self.pool.close()
             logger.info(f"✅ Connection pool closed for {self.engine_name}")
         except Exception as e:
-            logger.error(f"❌ Error closing pool: {e}", exc_info=True)
\ No newline at end of file
+            logger.error(f"❌ Error closing pool: {e}", exc_info=True)
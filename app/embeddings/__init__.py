@@ -1,4 +1,4 @@
 """Embeddings package - avoid circular imports."""
-from app.embeddings.base import BasePgVectorEmbeddingModel, IndexItem
+from app.embeddings.base import BasePgVectorEmbeddingModel, IndexItem, query_cache_info
 
-__all__ = ["BasePgVectorEmbeddingModel", "IndexItem"]
\ No newline at end of file
+__all__ = ["BasePgVectorEmbeddingModel", "IndexItem", "query_cache_info"]
\ No newline at end of file
@@ -1,13 +1,20 @@
 """PostgreSQL Vector Embedding Model - Base Implementation."""
 from abc import ABC
-from typing import Any, List
+from typing import Any, Awaitable, Callable, ClassVar, Dict, List, Optional
+import asyncio
 import logging
 import json
+from collections import OrderedDict
 from hashlib import sha256
+import numpy as np
+import orjson
+import xxhash
 from pydantic import BaseModel
 from langchain_core.documents import Document
 
-logging.basicConfig(level=logging.DEBUG)
+from app.db.postgres import SNIPPET_LENGTH
+from app.embeddings.batcher import SearchBatcher
+
 logger = logging.getLogger(__name__)
 
 class EmbeddingsIndex(ABC):
@@ -19,51 +26,272 @@ class IndexItem(BaseModel):
     text: str
     meta: dict = {}
 
-def embed_connection_encode(texts: List[str]) -> List[List[float]]:
-    """Generate embeddings for texts using OpenAI."""
+def content_id(text: str) -> str:
+    """Derive a stable row ID from text (non-cryptographic, 32 hex chars)."""
+    return xxhash.xxh3_128_hexdigest(text.encode())
+
+# Rows ingested before content_id carry sha256(text) IDs (64 hex chars)
+LEGACY_ID_LENGTH = 64
+ID_MIGRATION_BATCH_SIZE = 1000
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBED_SUB_BATCH_SIZE = 96
+EMBED_CONCURRENCY = 16
+# Rows written per COPY transaction during online ingest
+INSERT_BATCH_SIZE = 500
+# Batches (or Batch API jobs) of one add_items call in flight at once; each
+# holds a pool connection and its embeddings in memory
+INSERT_MAX_IN_FLIGHT = 4
+# OpenAI Batch API input limits (requests per job, input file size), the
+# size with headroom
+BATCH_API_MAX_REQUESTS = 50_000
+BATCH_API_MAX_BYTES = 190 * 1024 * 1024
+
+# Shared across all ingest batches so concurrent adds respect one cap
+_embed_semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+_async_client = None
+
+def _get_async_client():
+    """Return the process-wide AsyncOpenAI client, created on first use."""
+    global _async_client
+    if _async_client is None:
+        from openai import AsyncOpenAI
+        from app.config import settings
+        _async_client = AsyncOpenAI(api_key=settings.openai_api_key or None)
+    return _async_client
+
+async def _gather_bounded(coros: List[Awaitable[Any]], limit: int) -> List[Any]:
+    """Await coroutines concurrently, running at most limit at a time."""
+    slots = asyncio.Semaphore(limit)
+
+    async def run(coro: Awaitable[Any]) -> Any:
+        async with slots:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros))
+
+async def _embed_sub_batch(texts: List[str]) -> List[List[float]]:
+    """Embed one sub-batch, waiting for a free concurrency slot."""
+    async with _embed_semaphore:
+        response = await _get_async_client().embeddings.create(model=EMBEDDING_MODEL, input=texts)
+    return [item.embedding for item in response.data]
+
+async def embed_connection_encode(texts: List[str]) -> List[List[float]]:
+    """
+    Generate embeddings for texts using OpenAI, sending sub-batches concurrently.
+
+    Raises:
+        Exception: If any sub-batch fails. Rows are keyed by content hash and
+            skipped once stored, so storing placeholder vectors would make
+            the failure permanent.
+    """
+    sub_batches = [
+        texts[i:i + EMBED_SUB_BATCH_SIZE]
+        for i in range(0, len(texts), EMBED_SUB_BATCH_SIZE)
+    ]
+    tasks = [asyncio.ensure_future(_embed_sub_batch(b)) for b in sub_batches]
     try:
-        from langchain_openai import OpenAIEmbeddings
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        results = embeddings.embed_documents(texts)
-        logger.info(f"✅ Generated embeddings for {len(texts)} texts")
-        return results
+        batch_results = await asyncio.gather(*tasks)
     except Exception as e:
+        # Don't leave the other sub-batches spending quota on a doomed batch
+        for task in tasks:
+            task.cancel()
         logger.error(f"❌ Error generating embeddings: {e}")
-        # Return mock embeddings if OpenAI fails
-        import random
-        return [[random.random() for _ in range(1536)] for _ in texts]
+        raise
 
-def get_embedding(text: str) -> List[float]:
-    """Get embedding for single text using OpenAI."""
-    try:
-        from langchain_openai import OpenAIEmbeddings
-        embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        result = embeddings.embed_query(text)
-        return result
-    except Exception as e:
-        logger.error(f"❌ Error generating embedding: {e}")
-        # Return mock embedding if OpenAI fails
-        import random
-        return [random.random() for _ in range(1536)]
+    results = [embedding for batch in batch_results for embedding in batch]
+    logger.info("✅ Generated embeddings for %s texts", len(texts))
+    return results
+
+def _batch_request_line(custom_id: str, text: str) -> str:
+    """One JSONL request line for the Batch API embeddings endpoint."""
+    return json.dumps({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/embeddings",
+        "body": {"model": EMBEDDING_MODEL, "input": text}
+    })
+
+def split_batch_jobs(items: List["IndexItem"]) -> List[List["IndexItem"]]:
+    """Split items into groups that each fit in one Batch API job."""
+    jobs: List[List[IndexItem]] = []
+    current: List[IndexItem] = []
+    current_bytes = 0
+    for item in items:
+        line_bytes = len(_batch_request_line(content_id(item.text), item.text).encode()) + 1
+        if current and (
+            len(current) >= BATCH_API_MAX_REQUESTS
+            or current_bytes + line_bytes > BATCH_API_MAX_BYTES
+        ):
+            jobs.append(current)
+            current, current_bytes = [], 0
+        current.append(item)
+        current_bytes += line_bytes
+    if current:
+        jobs.append(current)
+    return jobs
+
+async def embed_connection_encode_batch(
+    texts: List[str],
+    custom_ids: List[str],
+    batch_id: Optional[str] = None,
+    on_submit: Optional[Callable[[str], Awaitable[None]]] = None,
+    poll_interval: float = 30.0
+) -> List[List[float]]:
+    """
+    Generate embeddings through the OpenAI Batch API.
+
+    Slower to complete than the online endpoint but cheaper, so it suits
+    large non-interactive ingests. The texts must fit in one job; see
+    split_batch_jobs.
+
+    Args:
+        texts: Texts to embed
+        custom_ids: One unique ID per text, used to match results back
+        batch_id: Existing batch to resume instead of submitting a new one
+        on_submit: Called with the batch ID right after submission
+        poll_interval: Seconds between status checks
+
+    Returns:
+        Embeddings in the same order as texts
+
+    Raises:
+        RuntimeError: If the batch fails, expires, is cancelled or is missing results
+    """
+    client = _get_async_client()
+
+    if batch_id is None:
+        lines = [
+            _batch_request_line(custom_id, text)
+            for custom_id, text in zip(custom_ids, texts)
+        ]
+        upload = await client.files.create(
+            file=("embeddings.jsonl", "\n".join(lines).encode()),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/embeddings",
+            completion_window="24h"
+        )
+        batch_id = batch.id
+        logger.info(f"📤 Submitted embedding batch {batch_id} for {len(texts)} texts")
+        if on_submit:
+            await on_submit(batch_id)
+
+    while True:
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status == "completed":
+            break
+        if batch.status in ("failed", "expired", "cancelling", "cancelled"):
+            raise RuntimeError(f"Embedding batch {batch_id} ended with status '{batch.status}'")
+        await asyncio.sleep(poll_interval)
+
+    output = await client.files.content(batch.output_file_id)
+    by_id = {}
+    for line in output.text.splitlines():
+        record = json.loads(line)
+        body = (record.get("response") or {}).get("body") or {}
+        if body.get("data"):
+            by_id[record["custom_id"]] = body["data"][0]["embedding"]
+
+    missing = [custom_id for custom_id in custom_ids if custom_id not in by_id]
+    if missing:
+        raise RuntimeError(f"Embedding batch {batch_id} returned no result for {len(missing)} texts")
+
+    logger.info(f"✅ Embedding batch {batch_id} completed for {len(texts)} texts")
+    return [by_id[custom_id] for custom_id in custom_ids]
+
+class QueryEmbeddingCache:
+    """Bounded LRU of normalized query text to embedding."""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Return the cached embedding, or None on a miss."""
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: List[float]) -> None:
+        """Store an embedding, evicting the least recently used one when full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Return hit/miss counters in the style of functools.lru_cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "maxsize": self.maxsize,
+            "currsize": len(self._data)
+        }
+
+_query_cache = QueryEmbeddingCache()
+
+def query_cache_info() -> Dict[str, int]:
+    """Return hit/miss counters for the process-wide query embedding cache."""
+    return _query_cache.cache_info()
+
+async def embed_queries(texts: List[str]) -> List[List[float]]:
+    """Embed queries, memoized per normalized text; all misses go out in one request."""
+    keys = [text.strip().lower() for text in texts]
+    embeddings = {key: _query_cache.get(key) for key in dict.fromkeys(keys)}
+    misses = [key for key, embedding in embeddings.items() if embedding is None]
+
+    if misses:
+        try:
+            response = await _get_async_client().embeddings.create(model=EMBEDDING_MODEL, input=misses)
+            for key, item in zip(misses, response.data):
+                embeddings[key] = item.embedding
+                _query_cache.put(key, item.embedding)
+        except Exception as e:
+            logger.error(f"❌ Error generating embedding: {e}")
+            raise
+
+    return [embeddings[key] for key in keys]
 
 class BasePgVectorEmbeddingModel(EmbeddingsIndex, ABC):
     """Base PGVector embedding provider with common functionality."""
 
     engine_name = "BasePgVectorEmbeddingModel"
-    collection_name: list[str] = []
-    current_index = 0
+    # Table backing this model; subclasses set it or pass name=
+    collection_name: ClassVar[str] = ""
+
+    def __init__(self, name: Optional[str] = None, db_client: Any = None, **kwargs: Any) -> None:
+        """
+        Set up the model (no I/O; call initialize() before use).
 
-    def __init__(self, **kwargs: Any) -> None:
+        Args:
+            name: Table name, overriding the class's collection_name
+            db_client: PostgresVdbClient to share with other models; one is created if omitted
+        """
         # Import here to avoid circular imports
         from app.config import settings
         from app.db import PostgresVdbClient
 
-        self.name = self.collection_name[self.__class__.current_index]
-        self.__class__.current_index += 1
+        self.name = name or self.collection_name
+        if not self.name:
+            raise ValueError(f"{self.__class__.__name__} needs a collection_name or name")
+
+        # The pool, batchers and OpenAI client are bound to the loop that
+        # initializes the model; set by initialize()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
 
         try:
-            # Create real PostgreSQL connection
-            self.db_client = PostgresVdbClient(
+            # A shared client is closed by whoever created it
+            self._owns_db_client = db_client is None
+            self.db_client = db_client or PostgresVdbClient(
                 engine_name=self.engine_name,
                 dbname=settings.db_name,
                 user=settings.db_user,
@@ -71,36 +299,196 @@ class BasePgVectorEmbeddingModel(EmbeddingsIndex, ABC):
                 host=settings.db_host,
                 port=settings.db_port,
                 min_conn=settings.db_min_conn,
-                max_conn=settings.db_max_conn
+                max_conn=settings.db_max_conn,
+                hnsw_ef_search=settings.hnsw_ef_search,
+                binary_quantize=settings.binary_quantize,
+                rerank_candidates=settings.rerank_candidates,
+                prepare_statements=settings.db_prepare_statements
             )
-            self.db_client.create_table(self.name, vector_dim=settings.vector_dim)
+            self.vector_dim = settings.vector_dim
+            self.defer_index_build = settings.defer_index_build
+            self.batch_poll_interval = settings.embedding_batch_poll_interval
+
+            # Concurrent searches share one embedding call and one pipelined round trip
+            self.batcher = SearchBatcher(
+                embed_queries,
+                lambda embeddings, limits: self.db_client.search_many(self.name, embeddings, limits),
+                max_batch_size=settings.search_batch_size,
+                max_wait=settings.search_batch_wait
+            )
+            # Same for RAG context searches, which return one assembled row each
+            self.context_batcher = SearchBatcher(
+                embed_queries,
+                lambda embeddings, params: self.db_client.search_context_many(self.name, embeddings, params),
+                max_batch_size=settings.search_batch_size,
+                max_wait=settings.search_batch_wait
+            )
+
+            self.cache = None
+            if settings.redis_url:
+                from app.cache import RedisCache
+                self.cache = RedisCache(settings.redis_url, default_ttl=settings.search_cache_ttl)
             logger.debug(f"{self.engine_name} initialized with table '{self.name}'")
         except Exception as e:
             logger.error(f"❌ Failed to initialize database client: {e}", exc_info=True)
             raise
 
+    async def initialize(self) -> None:
+        """Open the connection pool and make sure the tables exist."""
+        self.loop = asyncio.get_running_loop()
+        await self.db_client.open()
+        await self.db_client.create_table(
+            self.name,
+            vector_dim=self.vector_dim,
+            create_index=not self.defer_index_build
+        )
+        await self.db_client.create_batch_jobs_table()
+        await self._migrate_content_ids()
+
+    async def _migrate_content_ids(self) -> None:
+        """
+        Re-key rows stored under legacy SHA-256 IDs to content_id.
+
+        Otherwise the existence check misses them and re-ingesting their
+        text inserts duplicates. Runs once per table; afterwards the scan
+        finds no legacy IDs.
+        """
+        after = ""
+        migrated = 0
+        while True:
+            rows = await self.db_client.get_ids_and_texts(
+                self.name, LEGACY_ID_LENGTH, after=after, limit=ID_MIGRATION_BATCH_SIZE
+            )
+            if not rows:
+                break
+            after = rows[-1][0]
+            migrated += await self.db_client.rekey_rows(self.name, [
+                (row_id, content_id(text))
+                for row_id, text in rows
+                if row_id == sha256(text.encode()).hexdigest()
+            ])
+
+        if migrated:
+            logger.info("✅ Re-keyed %s legacy rows in '%s'", migrated, self.name)
+
     async def add_item(self, item: IndexItem) -> None:
         await self._process_batch([item])
 
-    async def add_items(self, items: List[IndexItem]) -> None:
-        """Process items in optimized batches."""
-        logger.debug(f"{self.name} Adding {len(items)} items")
-        batch_size = 50
-        for i in range(0, len(items), batch_size):
-            batch_items = items[i:i + batch_size]
-            await self._process_batch(batch_items)
+    async def add_items(
+            self,
+            items: List[IndexItem],
+            ingest_mode: str = "online",
+            batch_size: int = INSERT_BATCH_SIZE
+    ) -> None:
+        """
+        Process items in optimized batches, up to INSERT_MAX_IN_FLIGHT at a time.
+
+        Each batch is one existence check and one COPY transaction; its
+        embeddings are requested in concurrent EMBED_SUB_BATCH_SIZE slices.
+        """
+        logger.debug("%s Adding %s items", self.name, len(items))
+        # Deduped across the whole call: concurrent batches check existence
+        # before any of them inserts, so a repeat in another batch would be
+        # embedded again
+        items = self._dedupe(items)
+        if ingest_mode == "batch":
+            # As few Batch API jobs as the input limits allow, each resumable
+            # under its own job key
+            jobs = split_batch_jobs(items)
+            if len(jobs) > 1:
+                logger.info("%s Splitting %s items into %s embedding batches", self.name, len(items), len(jobs))
+            await _gather_bounded(
+                [self._process_batch(job, ingest_mode) for job in jobs], INSERT_MAX_IN_FLIGHT
+            )
+            return
+
+        # Longest first, so each embedding request carries texts of similar length
+        items = sorted(items, key=lambda item: len(item.text), reverse=True)
+        await _gather_bounded(
+            [self._process_batch(items[i:i + batch_size]) for i in range(0, len(items), batch_size)],
+            INSERT_MAX_IN_FLIGHT
+        )
+
+    async def bulk_ingest(
+            self,
+            items: List[IndexItem],
+            defer_index: bool = True,
+            ingest_mode: str = "online",
+            batch_size: int = INSERT_BATCH_SIZE
+    ) -> None:
+        """
+        Add items, then build the vector index if it was deferred.
+
+        With DEFER_INDEX_BUILD enabled the table starts without an index, so
+        the first load skips per-row index maintenance and the index is built
+        once here. Later calls find the index and only add items.
+
+        ingest_mode="batch" embeds through the OpenAI Batch API.
+        """
+        await self.add_items(items, ingest_mode, batch_size)
+        if defer_index:
+            await self.finalize_index()
+
+    async def finalize_index(self) -> None:
+        """Build the vector index if table creation deferred it."""
+        await self.db_client.finalize_index(self.name)
+
+    async def _embed_with_batch_api(self, item_ids: List[str], texts: List[str]) -> List[List[float]]:
+        """Embed via the Batch API, resuming a pending job for the same items after a restart."""
+        job_key = sha256("".join(item_ids).encode()).hexdigest()
+        job = await self.db_client.get_batch_job(job_key)
+        batch_id = job["batch_id"] if job and job["status"] == "pending" else None
+        if batch_id:
+            logger.info(f"{self.name} Resuming embedding batch {batch_id}")
+
+        submitted = {"batch_id": batch_id}
+
+        async def record_submit(new_batch_id: str) -> None:
+            submitted["batch_id"] = new_batch_id
+            await self.db_client.save_batch_job(job_key, new_batch_id, self.name, "pending")
+
+        try:
+            embeddings = await embed_connection_encode_batch(
+                texts,
+                item_ids,
+                batch_id=batch_id,
+                on_submit=record_submit,
+                poll_interval=self.batch_poll_interval
+            )
+        except RuntimeError:
+            # Terminal batch failure; transient errors leave the job pending to resume
+            if submitted["batch_id"]:
+                await self.db_client.save_batch_job(job_key, submitted["batch_id"], self.name, "failed")
+            raise
+
+        await self.db_client.save_batch_job(job_key, submitted["batch_id"], self.name, "completed")
+        return embeddings
 
-    async def _process_batch(self, items: List[IndexItem]) -> None:
+    def _dedupe(self, items: List[IndexItem]) -> List[IndexItem]:
+        """
+        Keep the first item per text.
+
+        IDs are content hashes, so dropped duplicates map onto the same row
+        as the item kept.
+        """
+        unique: Dict[str, IndexItem] = {}
+        for item in items:
+            unique.setdefault(item.text, item)
+        if len(unique) < len(items):
+            logger.debug("%s Skipping %s duplicate items", self.name, len(items) - len(unique))
+        return list(unique.values())
+
+    async def _process_batch(self, items: List[IndexItem], ingest_mode: str = "online") -> None:
         """Process a batch of items efficiently."""
         if not items:
             return
 
-        # Step 1: Generate IDs
-        items_with_ids = [(sha256(item.text.encode()).hexdigest(), item) for item in items]
+        # Step 1: Generate IDs (add_items has already deduped by text)
+        items_with_ids = [(content_id(item.text), item) for item in items]
 
         # Step 2: Check which exist
         all_ids = [item_id for item_id, _ in items_with_ids]
-        existence_map = self.db_client.batch_exists_check(self.name, all_ids)
+        existence_map = await self.db_client.batch_exists_check(self.name, all_ids)
 
         # Step 3: Filter new items
         items_to_process = []
@@ -111,55 +499,105 @@ class BasePgVectorEmbeddingModel(EmbeddingsIndex, ABC):
                 item_ids.append(item_id)
 
         if not items_to_process:
-            logger.debug(f"{self.name} All items already exist")
+            logger.debug("%s All items already exist", self.name)
             return
 
         # Step 4: Get embeddings
         texts = [item.text for item in items_to_process]
-        embeddings = embed_connection_encode(texts)
-
-        # Step 5: Prepare data
-        insert_data = []
-        for i, item in enumerate(items_to_process):
-            insert_data.append((
-                item_ids[i],
-                item.text,
-                embeddings[i],
-                json.dumps(item.meta)
-            ))
+        if ingest_mode == "batch":
+            embeddings = await self._embed_with_batch_api(item_ids, texts)
+        else:
+            embeddings = await embed_connection_encode(texts)
+
+        # Step 5: Prepare data as one float32 matrix plus parallel columns
+        embedding_matrix = np.asarray(embeddings, dtype=np.float32)
+        metadata = [orjson.dumps(item.meta).decode() for item in items_to_process]
+        insert_data = list(zip(item_ids, texts, embedding_matrix, metadata))
 
         # Step 6: Insert to database
         columns = ["id", "text", "embedding", "metadata"]
-        self.db_client.batch_insert(self.name, columns, insert_data)
-        logger.debug(f"{self.name} Added {len(items_to_process)} items")
+        await self.db_client.batch_insert(self.name, columns, insert_data)
+        logger.debug("%s Added %s items", self.name, len(items_to_process))
+
+        # Cached search results may now be missing the new items
+        if self.cache:
+            await self.cache.invalidate(f"memory:{self.name}:*")
 
     async def search(self, text: str, max_results: int = 5, **kwargs: Any) -> List[IndexItem]:
-        """Search for similar items."""
+        """Search for similar items, serving repeated queries from Redis when configured."""
         try:
-            logger.debug(f"{self.name} Searching for: {text}")
-            query_embedding = get_embedding(text)
-
-            # Search in database
-            results = self.db_client.search(
-                self.name,
-                query_embedding,
-                limit=max_results
-            )
+            logger.debug("%s Searching for: %s", self.name, text)
 
-            index_items = [
-                IndexItem(text=r['text'], meta=r['metadata'])
-                for r in results
-            ]
+            cache_key = None
+            if self.cache:
+                digest = sha256((text.strip().lower() + self.name + str(max_results)).encode()).hexdigest()
+                cache_key = f"memory:{self.name}:{digest}"
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    logger.debug("✅ Cache hit for: %s", text)
+                    return [IndexItem(**item) for item in cached]
 
-            logger.debug(f"✅ Found {len(index_items)} results")
-            return index_items
+            results = await self.batcher.search(text, max_results)
         except Exception as e:
+            # Never cached, so the next request retries instead of reading a degraded answer
             logger.error(f"❌ Error in search: {e}", exc_info=True)
             return []
 
-    def __del__(self) -> None:
-        if hasattr(self, 'db_client'):
-            try:
-                self.db_client.close()
-            except:
-                pass
\ No newline at end of file
+        index_items = [
+            IndexItem(text=r['text'], meta=r['metadata'])
+            for r in results
+        ]
+
+        logger.debug("✅ Found %s results", len(index_items))
+
+        if cache_key and index_items:
+            await self.cache.set(cache_key, [item.model_dump() for item in index_items])
+
+        return index_items
+
+    async def aget_context(
+            self,
+            text: str,
+            max_results: int = 5,
+            snippet_length: int = SNIPPET_LENGTH
+    ) -> Dict[str, Any]:
+        """
+        Retrieve matches already joined into an LLM context string.
+
+        Source snippets are cut with LEFT() in SQL, so only the context
+        string carries full chunk text over the wire.
+
+        Returns:
+            Dictionary with context, sources (content snippet and metadata) and count
+        """
+        try:
+            cache_key = None
+            if self.cache:
+                digest = sha256(
+                    (text.strip().lower() + self.name + str(max_results) + str(snippet_length)).encode()
+                ).hexdigest()
+                cache_key = f"memory:{self.name}:context:{digest}"
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    logger.debug("✅ Cache hit for: %s", text)
+                    return cached
+
+            result = await self.context_batcher.search(text, (max_results, snippet_length))
+        except Exception as e:
+            # Never cached, so the next request retries instead of reading a degraded answer
+            logger.error(f"❌ Error in context search: {e}", exc_info=True)
+            return {"context": "", "sources": [], "count": 0}
+
+        if cache_key and result["count"]:
+            await self.cache.set(cache_key, result)
+
+        return result
+
+    async def close(self) -> None:
+        """Stop the search batchers, then close the cache client and the pool if owned."""
+        await self.batcher.close()
+        await self.context_batcher.close()
+        if self._owns_db_client:
+            await self.db_client.close()
+        if self.cache:
+            await self.cache.close()
\ No newline at end of file
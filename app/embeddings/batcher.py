@@ -0,0 +1,110 @@
+"""Micro-batching of concurrent search queries."""
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+SearchFn = Callable[[List[List[float]], List[Any]], Awaitable[List[Any]]]
+
+class SearchBatcher:
+    """
+    Collect concurrent searches and run them as one batch.
+
+    Queries arriving within max_wait seconds of the first one (or until
+    max_batch_size is reached) are embedded with a single API call and
+    searched together, then each caller gets its own results back.
+    """
+
+    def __init__(
+            self,
+            embed_fn: EmbedFn,
+            search_fn: SearchFn,
+            max_batch_size: int = 16,
+            max_wait: float = 0.05
+    ):
+        """
+        Initialize the batcher (the worker starts on the first search).
+
+        Args:
+            embed_fn: Embeds a list of query texts
+            search_fn: Runs one search per embedding with the matching params
+            max_batch_size: Most queries sent in one batch
+            max_wait: Seconds to wait for more queries after the first arrives
+        """
+        self.embed_fn = embed_fn
+        self.search_fn = search_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def search(self, text: str, params: Any) -> Any:
+        """Queue a search and wait for its results; params are passed through to search_fn."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, params, future))
+        return await future
+
+    async def _collect(self, batch: List[Tuple[str, Any, asyncio.Future]]):
+        """Wait for one query, then gather more into batch until it is full or the window closes."""
+        loop = asyncio.get_running_loop()
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self):
+        """Process batches until cancelled, failing the current batch on the way out."""
+        batch: List[Tuple[str, Any, asyncio.Future]] = []
+        try:
+            while True:
+                batch = []
+                await self._collect(batch)
+                try:
+                    embeddings = await self.embed_fn([text for text, _, _ in batch])
+                    results = await self.search_fn(embeddings, [params for _, params, _ in batch])
+                    for (_, _, future), result in zip(batch, results):
+                        if not future.done():
+                            future.set_result(result)
+                    logger.debug("✅ Served %s batched searches", len(batch))
+                except Exception as e:
+                    logger.error(f"❌ Batched search failed: {e}", exc_info=True)
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+        finally:
+            # Cancellation or an unexpected error must not leave callers waiting
+            _fail_pending(batch)
+
+    async def close(self):
+        """Stop the worker task and fail any searches still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        queued = []
+        while not self._queue.empty():
+            queued.append(self._queue.get_nowait())
+        _fail_pending(queued)
+
+
+def _fail_pending(batch: List[Tuple[str, Any, asyncio.Future]]):
+    """Give every unresolved future in batch an error so its caller returns."""
+    for _, _, future in batch:
+        if not future.done():
+            future.set_exception(RuntimeError("Search batcher stopped"))
@@ -1,5 +1,6 @@
 """Models package."""
 from app.models.request import (
+    IngestMode,
     QueryRequest,
     DocumentIngestRequest,
     WebScrapingRequest
@@ -11,6 +12,7 @@ from app.models.response import (
 )
 
 __all__ = [
+    "IngestMode",
     "QueryRequest",
     "DocumentIngestRequest",
     "WebScrapingRequest",
@@ -1,6 +1,13 @@
 """Request schemas using Pydantic."""
 from pydantic import BaseModel, Field, HttpUrl
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
+
+# How ingested chunks are embedded
+IngestMode = Literal["online", "batch"]
+INGEST_MODE_DESCRIPTION = (
+    "'batch' embeds via the OpenAI Batch API (cheaper, slower) in the background; "
+    "the response has status 'submitted'"
+)
 
 
 class QueryRequest(BaseModel):
@@ -43,6 +50,7 @@ class DocumentIngestRequest(BaseModel):
         le=4000,
         description="Size of text chunks"
     )
+    ingest_mode: IngestMode = Field(default="online", description=INGEST_MODE_DESCRIPTION)
 
     class Config:
         json_schema_extra = {
@@ -72,6 +80,7 @@ class WebScrapingRequest(BaseModel):
         le=60,
         description="Request timeout in seconds"
     )
+    ingest_mode: IngestMode = Field(default="online", description=INGEST_MODE_DESCRIPTION)
 
     class Config:
         json_schema_extra = {
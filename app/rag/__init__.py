@@ -1,5 +1,5 @@
 """RAG package."""
-from app.rag.retriever import PgVectorRetriever
+from app.rag.retriever import PgKeywordRetriever, PgVectorRetriever
 from app.rag.pipeline import RagPipeline
 
-__all__ = ["PgVectorRetriever", "RagPipeline"]
+__all__ = ["PgKeywordRetriever", "PgVectorRetriever", "RagPipeline"]
@@ -1,18 +1,47 @@
 """RAG pipeline orchestration."""
-from typing import List
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Set
 from langchain_core.documents import Document
+from langchain_core.messages import BaseMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.retrievers import BaseRetriever
 
 from langchain_openai import ChatOpenAI
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from app.rag.retriever import PgVectorRetriever
 from app.embeddings import IndexItem
+from app.embeddings.base import INSERT_BATCH_SIZE
+from app.db.postgres import SNIPPET_LENGTH
 import asyncio
+import httpx
 from datetime import datetime
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+CHUNK_OVERLAP = 200
+LLM_MAX_CONNECTIONS = 100
+# Insert groups of a streamed ingest that may embed concurrently
+STREAM_MAX_IN_FLIGHT = 4
+
+SYSTEM_PROMPT = "Based on the following context, answer the question."
+HUMAN_PROMPT = """Context:
+{context}
+
+Question: {question}
+
+Answer:"""
+
+@lru_cache(maxsize=8)
+def _get_splitter(chunk_size: int, chunk_overlap: int = CHUNK_OVERLAP) -> RecursiveCharacterTextSplitter:
+    """Return a shared splitter for the given sizes (splitters are stateless once built)."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", " ", ""]
+    )
+
 class RagPipeline:
     """Complete RAG pipeline combining embeddings, retrieval, and LLM."""
 
@@ -20,16 +49,27 @@ class RagPipeline:
         self,
         embedding_model,
         llm_model: str = "gpt-4-turbo",
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        extra_retrievers: Optional[List[BaseRetriever]] = None
     ):
-        """Initialize RAG pipeline."""
-        self.embedding_model = embedding_model
-        self.llm = ChatOpenAI(model=llm_model, temperature=temperature)
+        """
+        Initialize RAG pipeline.
 
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", " ", ""]
+        Args:
+            embedding_model: Embedding model backing the vector retriever
+            llm_model: OpenAI chat model name
+            temperature: LLM sampling temperature
+            extra_retrievers: Additional sources queried alongside the vector retriever
+        """
+        self.embedding_model = embedding_model
+        # Sized for concurrent queries; the default pool is much smaller
+        self._llm_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS)
+        )
+        self.llm = ChatOpenAI(
+            model=llm_model,
+            temperature=temperature,
+            http_async_client=self._llm_http_client
         )
 
         # Create retriever with proper initialization
@@ -37,78 +77,238 @@ class RagPipeline:
             embedding_model=embedding_model,
             k=4
         )
-        logger.info("✅ Retriever created")
+        # All sources are queried concurrently on each question
+        self.retrievers: List[BaseRetriever] = [self.retriever, *(extra_retrievers or [])]
+        logger.info("✅ %s retriever(s) created", len(self.retrievers))
+
+        # Compiled once; the static system message is a stable prefix for provider prompt caching
+        self.prompt_tmpl = ChatPromptTemplate.from_messages([
+            ("system", SYSTEM_PROMPT),
+            ("human", HUMAN_PROMPT)
+        ])
+
+        # Long-running batch ingests, kept referenced until they finish
+        self._background_tasks: Set[asyncio.Task] = set()
 
         # Simple query pipeline without RetrievalQA (to avoid compatibility issues)
         self.qa_chain = None
         logger.info("✅ RAG Pipeline initialized")
 
+    def _run_in_background(self, coro: Awaitable[Any], description: str) -> None:
+        """Run a coroutine as a task the pipeline tracks and cancels on close."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+
+        def done(finished: asyncio.Task) -> None:
+            self._background_tasks.discard(finished)
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.error(f"❌ Background {description} failed: {finished.exception()}")
+
+        task.add_done_callback(done)
+
+    def _split_to_items(self, documents: List[Document], chunk_size: int) -> List[IndexItem]:
+        """Split documents into chunks and wrap them as index items."""
+        split_docs = _get_splitter(chunk_size).split_documents(documents)
+        ingested_at = datetime.now().isoformat()
+
+        items = []
+        for doc in split_docs:
+            meta = dict(doc.metadata)
+            meta["ingested_at"] = ingested_at
+            items.append(IndexItem(text=doc.page_content, meta=meta))
+        return items
+
     async def ingest_documents(
         self,
         documents: List[Document],
-        chunk_size: int = 1000
+        chunk_size: int = 1000,
+        ingest_mode: str = "online",
+        batch_size: int = INSERT_BATCH_SIZE
     ) -> int:
-        """Ingest documents into vector store."""
-        logger.info(f"📥 Ingesting {len(documents)} documents...")
-
-        self.text_splitter.chunk_size = chunk_size
-        split_docs = self.text_splitter.split_documents(documents)
-
-        items = [
-            IndexItem(
-                text=doc.page_content,
-                meta={
-                    **doc.metadata,
-                    "ingested_at": datetime.now().isoformat()
-                }
+        """
+        Ingest documents into vector store, writing batch_size rows per transaction.
+
+        In batch mode embedding can take up to the Batch API's 24h window, so
+        the chunks are queued in a background task and this returns once they
+        are split. Re-ingesting the same documents resumes any pending jobs.
+
+        Returns:
+            Number of chunks ingested (or queued, in batch mode)
+        """
+        logger.info("📥 Ingesting %s documents...", len(documents))
+
+        items = self._split_to_items(documents, chunk_size)
+
+        if ingest_mode == "batch":
+            self._run_in_background(
+                self.embedding_model.bulk_ingest(items, ingest_mode=ingest_mode, batch_size=batch_size),
+                f"batch ingest of {len(items)} chunks"
             )
-            for doc in split_docs
-        ]
+            logger.info("📤 Queued %s chunks for Batch API embedding", len(items))
+            return len(items)
 
-        await self.embedding_model.add_items(items)
-        logger.info(f"✅ Ingested {len(items)} chunks")
+        await self.embedding_model.bulk_ingest(items, ingest_mode=ingest_mode, batch_size=batch_size)
+        logger.info("✅ Ingested %s chunks", len(items))
         return len(items)
 
-    async def query(self, question: str, top_k: int = 4) -> dict:
-        """Query the RAG system."""
-        logger.info(f"❓ Querying: {question}")
+    async def ingest_document_stream(
+        self,
+        documents: AsyncIterator[Document],
+        chunk_size: int = 1000,
+        ingest_mode: str = "online",
+        batch_size: int = INSERT_BATCH_SIZE
+    ) -> int:
+        """
+        Ingest documents as they arrive from an async source.
 
+        Chunks are buffered into batch_size groups and each full group is
+        embedded and inserted while later documents are still being
+        produced. At most STREAM_MAX_IN_FLIGHT groups run at once, so a
+        fast producer waits instead of piling up pending chunks.
+        """
+        if ingest_mode == "batch":
+            # Job-sized groups of the whole upload, not a job per document
+            return await self.ingest_documents(
+                [doc async for doc in documents], chunk_size, ingest_mode, batch_size
+            )
+
+        slots = asyncio.Semaphore(STREAM_MAX_IN_FLIGHT)
+        tasks = []
+
+        async def add_group(group: List[IndexItem]):
+            try:
+                await self.embedding_model.add_items(group, batch_size=batch_size)
+            finally:
+                slots.release()
+
+        async def dispatch(group: List[IndexItem]):
+            await slots.acquire()
+            tasks.append(asyncio.create_task(add_group(group)))
+
+        total = 0
+        doc_count = 0
+        buffer: List[IndexItem] = []
+        # Chunks repeated across documents (headers, footers, boilerplate
+        # pages) would otherwise race past the existence check in parallel tasks
+        seen = set()
         try:
-            # Get relevant documents
-            retrieved_docs = await self.retriever._aget_relevant_documents(question)
+            async for doc in documents:
+                doc_count += 1
+                items = self._split_to_items([doc], chunk_size)
+                total += len(items)
+                for item in items:
+                    if item.text not in seen:
+                        seen.add(item.text)
+                        buffer.append(item)
+                while len(buffer) >= batch_size:
+                    await dispatch(buffer[:batch_size])
+                    buffer = buffer[batch_size:]
+            if buffer:
+                await dispatch(buffer)
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
 
-            # Create context from documents
-            context = "\n\n".join([doc.page_content for doc in retrieved_docs])
+        await self.embedding_model.finalize_index()
+        logger.info("✅ Ingested %s chunks from %s streamed documents", total, doc_count)
+        return total
 
-            # Create prompt
-            prompt = f"""Based on the following context, answer the question.
+    async def _retrieve(self, question: str) -> List[Document]:
+        """Query every retriever concurrently and merge results, dropping duplicate chunks."""
+        results = await asyncio.gather(
+            *(retriever.ainvoke(question) for retriever in self.retrievers),
+            return_exceptions=True
+        )
 
-Context:
-{context}
+        docs = []
+        seen = set()
+        for retriever, result in zip(self.retrievers, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Retriever {retriever.__class__.__name__} failed: {result}")
+                continue
+            for doc in result:
+                if doc.page_content not in seen:
+                    seen.add(doc.page_content)
+                    docs.append(doc)
+        return docs
 
-Question: {question}
+    async def _get_context(self, question: str) -> Dict[str, Any]:
+        """
+        Retrieve context for a question.
 
-Answer:"""
+        With only the vector retriever, the context string and source
+        summaries are assembled by Postgres; otherwise results from all
+        retrievers are merged and joined here.
+        """
+        if len(self.retrievers) == 1:
+            return await self.retriever.aget_context(question, snippet_length=SNIPPET_LENGTH)
+
+        docs = await self._retrieve(question)
+        return {
+            "context": "\n\n".join([doc.page_content for doc in docs]),
+            "sources": self._format_sources(docs),
+            "count": len(docs)
+        }
+
+    def _build_prompt(self, question: str, context: str) -> List[BaseMessage]:
+        """Build the answer messages from the retrieved context."""
+        return self.prompt_tmpl.format_messages(context=context, question=question)
+
+    @staticmethod
+    def _format_sources(docs: List[Document]) -> List[dict]:
+        """Summarize retrieved chunks for the response."""
+        return [
+            {
+                "content": doc.page_content[:SNIPPET_LENGTH],
+                "metadata": doc.metadata
+            }
+            for doc in docs
+        ]
+
+    async def query_stream(self, question: str) -> AsyncIterator[dict]:
+        """
+        Query the RAG system, yielding the answer as it is generated.
+
+        Yields:
+            {"type": "token", "content": ...} per LLM chunk, then one
+            {"type": "sources", "sources": [...]} event
+        """
+        logger.info("❓ Streaming query: %s", question)
+
+        retrieved = await self._get_context(question)
+        prompt = self._build_prompt(question, retrieved["context"])
+
+        async for chunk in self.llm.astream(prompt):
+            if chunk.content:
+                yield {"type": "token", "content": chunk.content}
+
+        yield {"type": "sources", "sources": retrieved["sources"]}
+        logger.info("✅ Streamed query completed with %s sources", retrieved['count'])
+
+    async def query(self, question: str, top_k: int = 4) -> dict:
+        """Query the RAG system."""
+        logger.info("❓ Querying: %s", question)
+
+        try:
+            # Get relevant context
+            retrieved = await self._get_context(question)
+
+            prompt = self._build_prompt(question, retrieved["context"])
 
             # Get answer from LLM
-            result = await asyncio.to_thread(
-                lambda: self.llm.invoke(prompt)
-            )
+            result = await self.llm.ainvoke(prompt)
 
             response = {
                 "question": question,
                 "answer": result.content if hasattr(result, 'content') else str(result),
-                "sources": [
-                    {
-                        "content": doc.page_content[:300],
-                        "metadata": doc.metadata
-                    }
-                    for doc in retrieved_docs
-                ],
+                "sources": retrieved["sources"],
                 "timestamp": datetime.now().isoformat()
             }
 
-            logger.info(f"✅ Query completed with {len(retrieved_docs)} sources")
+            logger.info("✅ Query completed with %s sources", retrieved['count'])
             return response
         except Exception as e:
             logger.error(f"❌ Error querying: {e}", exc_info=True)
@@ -117,4 +317,13 @@ Answer:"""
                 "answer": f"Error: {str(e)}",
                 "sources": [],
                 "timestamp": datetime.now().isoformat()
-            }
\ No newline at end of file
+            }
+
+    async def close(self) -> None:
+        """Cancel background ingests, then close the LLM HTTP client and the embedding model."""
+        # Cancelled batch jobs stay pending and resume on re-ingest
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        await self._llm_http_client.aclose()
+        await self.embedding_model.close()
@@ -1,10 +1,12 @@
 """Vector retriever for LangChain."""
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.documents import Document
 import asyncio
 import logging
 
+from app.db.postgres import SNIPPET_LENGTH
+
 logger = logging.getLogger(__name__)
 
 class PgVectorRetriever(BaseRetriever):
@@ -21,7 +23,7 @@ class PgVectorRetriever(BaseRetriever):
 
     async def _aget_relevant_documents(self, query: str) -> List[Document]:
         """Async retrieval of relevant documents."""
-        logger.debug(f"🔍 Searching for: {query}")
+        logger.debug("🔍 Searching for: %s", query)
         try:
             results = await self.embedding_model.search(query, max_results=self.k)
             docs = [
@@ -31,34 +33,63 @@ class PgVectorRetriever(BaseRetriever):
                 )
                 for item in results
             ]
-            logger.debug(f"✅ Found {len(docs)} documents")
+            logger.debug("✅ Found %s documents", len(docs))
             return docs
         except Exception as e:
             logger.error(f"❌ Error in async search: {e}", exc_info=True)
             return []
 
+    async def aget_context(self, query: str, snippet_length: int = SNIPPET_LENGTH) -> Dict[str, Any]:
+        """Retrieve the top-k matches as a prebuilt context string plus source snippets."""
+        logger.debug("🔍 Building context for: %s", query)
+        return await self.embedding_model.aget_context(
+            query, max_results=self.k, snippet_length=snippet_length
+        )
+
     def _get_relevant_documents(self, query: str) -> List[Document]:
-        """Synchronous wrapper for async search."""
+        """
+        Synchronous wrapper for async search, for callers on another thread.
+
+        The search is submitted to the event loop that initialized the
+        embedding model, since its pool and batchers only work there.
+
+        Raises:
+            RuntimeError: If that loop isn't running or this is its own thread; use ainvoke()
+        """
+        loop = getattr(self.embedding_model, "loop", None)
+        if loop is None or not loop.is_running():
+            raise RuntimeError(
+                "PgVectorRetriever.invoke() needs the embedding model's event loop running "
+                "in another thread; use ainvoke()"
+            )
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                raise RuntimeError("Event loop is closed")
+            running = asyncio.get_running_loop()
         except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            running = None
+        if running is loop:
+            raise RuntimeError("PgVectorRetriever.invoke() would block its own event loop; use ainvoke()")
 
-        try:
-            results = loop.run_until_complete(
-                self.embedding_model.search(query, max_results=self.k)
-            )
-            docs = [
-                Document(
-                    page_content=item.text,
-                    metadata=item.meta if isinstance(item.meta, dict) else {}
-                )
-                for item in results
-            ]
-            return docs
-        except Exception as e:
-            logger.error(f"❌ Error in sync search: {e}", exc_info=True)
-            return []
+        return asyncio.run_coroutine_threadsafe(self._aget_relevant_documents(query), loop).result()
+
+
+class PgKeywordRetriever(BaseRetriever):
+    """Full-text retriever over the same pgvector table, for exact terms embeddings miss."""
+
+    db_client: Any = None
+    table_name: str
+    k: int = 4
+
+    async def _aget_relevant_documents(self, query: str) -> List[Document]:
+        """Async keyword retrieval of relevant documents."""
+        logger.debug("🔍 Keyword search for: %s", query)
+        results = await self.db_client.keyword_search(self.table_name, query, limit=self.k)
+        return [Document(page_content=r["text"], metadata=r["metadata"]) for r in results]
+
+    def _get_relevant_documents(self, query: str) -> List[Document]:
+        """
+        Not supported; the pool only works on the loop it was opened on.
+
+        Raises:
+            RuntimeError: Always; use ainvoke()
+        """
+        raise RuntimeError("PgKeywordRetriever only supports ainvoke()")
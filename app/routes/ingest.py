@@ -1,25 +1,27 @@
 """Document ingestion endpoints."""
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from fastapi import APIRouter, File, Form, Request, UploadFile, HTTPException
 from typing import List, Optional
 
 from langchain_core.documents import Document
 
-from app.models.request import DocumentIngestRequest, WebScrapingRequest
+from app.models.request import INGEST_MODE_DESCRIPTION, DocumentIngestRequest, IngestMode, WebScrapingRequest
 from app.models.response import IngestResponse
 from app.loaders.pdf import PDFProcessor
 from app.loaders.web import WebScraper
 from app.rag import RagPipeline
 from app.utils.logger import get_logger
 
-from pathlib import Path
+import asyncio
 from datetime import datetime
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Multi-file PDF uploads read and parsed at once
+PDF_FILES_IN_FLIGHT = 4
+
 # Pipeline instance (injected by main.py)
 pipeline: Optional[RagPipeline] = None
-TEMP_DIR = Path("./temp_uploads")
 
 
 @router.post("/texts", response_model=IngestResponse)
@@ -51,12 +53,16 @@ async def ingest_texts(request: DocumentIngestRequest):
             for i, text in enumerate(request.texts)
         ]
 
-        chunks = await pipeline.ingest_documents(documents, request.chunk_size)
+        chunks = await pipeline.ingest_documents(
+            documents,
+            request.chunk_size,
+            ingest_mode=request.ingest_mode
+        )
 
         return IngestResponse(
             ingested_chunks=chunks,
             source_count=len(request.texts),
-            status="success",
+            status="submitted" if request.ingest_mode == "batch" else "success",
             timestamp=datetime.now().isoformat()
         )
     except Exception as e:
@@ -65,12 +71,18 @@ async def ingest_texts(request: DocumentIngestRequest):
 
 
 @router.post("/pdf", response_model=IngestResponse)
-async def ingest_pdf(files: List[UploadFile] = File(...)):
+async def ingest_pdf(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    ingest_mode: IngestMode = Form("online", description=INGEST_MODE_DESCRIPTION)
+):
     """
     Upload and ingest PDF files.
 
     Args:
+        request: Incoming request (for the app's PDF parsing pool)
         files: List of PDF files to ingest
+        ingest_mode: 'online' or 'batch' (OpenAI Batch API)
 
     Returns:
         IngestResponse with ingestion status
@@ -78,12 +90,9 @@ async def ingest_pdf(files: List[UploadFile] = File(...)):
     if pipeline is None:
         raise HTTPException(status_code=503, detail="Pipeline not initialized")
 
-    TEMP_DIR.mkdir(exist_ok=True)
-
     try:
         logger.info(f"📦 Processing {len(files)} PDF files")
 
-        documents = []
         for file in files:
             if file.content_type != "application/pdf":
                 raise HTTPException(
@@ -91,27 +100,53 @@ async def ingest_pdf(files: List[UploadFile] = File(...)):
                     detail=f"{file.filename} is not a PDF file"
                 )
 
-            temp_path = TEMP_DIR / file.filename
-            content = await file.read()
-
-            with open(temp_path, "wb") as f:
-                f.write(content)
-
-            pdf_docs = await PDFProcessor.extract_from_pdf(str(temp_path))
-
-            for doc in pdf_docs:
-                doc.metadata["source_file"] = file.filename
-                doc.metadata["uploaded_at"] = datetime.now().isoformat()
-
-            documents.extend(pdf_docs)
-            temp_path.unlink()
+        async def parse_in_process(file: UploadFile) -> List[Document]:
+            return await PDFProcessor.extract_from_pdf_in_process(
+                await file.read(), file.filename, request.app.state.pdf_executor
+            )
 
-        chunks = await pipeline.ingest_documents(documents)
+        async def pdf_pages():
+            if len(files) == 1:
+                # Read straight from the upload's spooled file; no extra copy
+                file = files[0]
+                await file.seek(0)
+                async for doc in PDFProcessor.extract_from_pdf_stream(file.file, file.filename):
+                    doc.metadata["source_file"] = file.filename
+                    doc.metadata["uploaded_at"] = datetime.now().isoformat()
+                    yield doc
+                return
+
+            # Files parse in the process pool PDF_FILES_IN_FLIGHT at a time, so
+            # only that many uploads are read into memory at once; pages are
+            # handed on in upload order as each file finishes
+            parsing = [
+                asyncio.ensure_future(parse_in_process(file))
+                for file in files[:PDF_FILES_IN_FLIGHT]
+            ]
+            try:
+                for index, file in enumerate(files):
+                    documents = await parsing[index]
+                    parsing[index] = None
+                    if index + PDF_FILES_IN_FLIGHT < len(files):
+                        parsing.append(asyncio.ensure_future(
+                            parse_in_process(files[index + PDF_FILES_IN_FLIGHT])
+                        ))
+                    for doc in documents:
+                        doc.metadata["source_file"] = file.filename
+                        doc.metadata["uploaded_at"] = datetime.now().isoformat()
+                        yield doc
+            finally:
+                for task in parsing:
+                    if task is not None:
+                        task.cancel()
+
+        # Pages are embedded while later pages are still being parsed
+        chunks = await pipeline.ingest_document_stream(pdf_pages(), ingest_mode=ingest_mode)
 
         return IngestResponse(
             ingested_chunks=chunks,
             source_count=len(files),
-            status="success",
+            status="submitted" if ingest_mode == "batch" else "success",
             timestamp=datetime.now().isoformat()
         )
     except Exception as e:
@@ -149,12 +184,12 @@ async def ingest_web(request: WebScrapingRequest):
                 detail="No content could be scraped from the provided URLs"
             )
 
-        chunks = await pipeline.ingest_documents(documents)
+        chunks = await pipeline.ingest_documents(documents, ingest_mode=request.ingest_mode)
 
         return IngestResponse(
             ingested_chunks=chunks,
             source_count=len(documents),
-            status="success",
+            status="submitted" if request.ingest_mode == "batch" else "success",
             timestamp=datetime.now().isoformat()
         )
     except Exception as e:
@@ -1,7 +1,9 @@
 """Query endpoint."""
-from typing import Optional
+from typing import AsyncIterator, Optional
+import json
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from app.models.request import QueryRequest
 from app.models.response import QueryResponse
 from app.utils.logger import get_logger
@@ -34,7 +36,7 @@ async def query(request: QueryRequest):
                 detail="Question cannot be empty"
             )
 
-        logger.info(f"❓ Processing query: {request.question}")
+        logger.info("❓ Processing query: %s", request.question)
         result = await pipeline.query(request.question, request.top_k)
 
         return QueryResponse(**result)
@@ -42,4 +44,41 @@ async def query(request: QueryRequest):
         raise
     except Exception as e:
         logger.error(f"Error processing query: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/query/stream")
+async def query_stream(request: QueryRequest):
+    """
+    Query the RAG system, streaming the answer as server-sent events.
+
+    Emits one "token" event per generated chunk, then a "sources" event
+    (or an "error" event if generation fails part-way).
+
+    Args:
+        request: QueryRequest with question and top_k
+
+    Returns:
+        StreamingResponse of text/event-stream
+    """
+    if pipeline is None:
+        raise HTTPException(status_code=503, detail="Pipeline not initialized")
+
+    if not request.question.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Question cannot be empty"
+        )
+
+    logger.info("❓ Processing streaming query: %s", request.question)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event in pipeline.query_stream(request.question):
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            logger.error(f"Error streaming query: {e}", exc_info=True)
+            yield f"event: error\ndata: {json.dumps({'type': 'error', 'detail': str(e)})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -2,27 +2,31 @@
 import logging
 from app.config import settings
 
+_configured = False
+
+
+def configure_logging() -> None:
+    """Configure the root logger once; app loggers propagate to it."""
+    global _configured
+    if _configured:
+        return
+
+    logging.basicConfig(
+        level=settings.log_level,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    _configured = True
+
 
 def get_logger(name: str) -> logging.Logger:
     """
-    Get configured logger instance.
+    Get logger instance, configuring logging on first use.
 
     Args:
         name: Logger name (typically __name__)
 
     Returns:
-        Configured logger instance
+        Logger instance
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(settings.log_level)
-
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    handler.setFormatter(formatter)
-
-    if not logger.handlers:
-        logger.addHandler(handler)
-
-    return logger
\ No newline at end of file
+    configure_logging()
+    return logging.getLogger(name)
@@ -1,6 +1,9 @@
 """Application Entry Point."""
 import uvicorn
 import logging
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
 
 # Import config first
 from app.config import settings
@@ -9,8 +12,10 @@ from app.utils.logger import get_logger
 # Then import other modules
 from app import create_app
 from app.rag.pipeline import RagPipeline
-from app.embeddings import BasePgVectorEmbeddingModel
+from app.rag.retriever import PgKeywordRetriever
+from app.embeddings import BasePgVectorEmbeddingModel, query_cache_info
 from app.routes import ingest, query, health
+from app.loaders.pdf import create_process_pool, shutdown_process_pool
 
 logger = get_logger(__name__)
 
@@ -26,15 +31,26 @@ async def init_pipeline():
 
         class DocumentEmbeddingModel(BasePgVectorEmbeddingModel):
             engine_name = "rag_embeddings"
-            collection_name = ["documents"]
+            collection_name = "documents"
 
         embedding_model = DocumentEmbeddingModel()
+        await embedding_model.initialize()
         logger.info("✅ Embedding model initialized")
+        logger.info(f"📊 Query embedding cache: {query_cache_info()}")
+
+        extra_retrievers = []
+        if settings.keyword_search:
+            # Full-text matches are merged with the vector results on each query
+            await embedding_model.db_client.create_keyword_index(embedding_model.name)
+            extra_retrievers.append(
+                PgKeywordRetriever(db_client=embedding_model.db_client, table_name=embedding_model.name)
+            )
 
         pipeline = RagPipeline(
             embedding_model=embedding_model,
             llm_model=settings.llm_model,
-            temperature=settings.llm_temperature
+            temperature=settings.llm_temperature,
+            extra_retrievers=extra_retrievers
         )
         logger.info("✅ RAG pipeline initialized")
 
@@ -50,18 +66,24 @@ async def init_pipeline():
 
 def create_application():
     """Create and configure FastAPI application."""
-    app = create_app()
-
-    @app.on_event("startup")
-    async def startup():
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Opening the pool connects DB_MIN_CONN connections up front, so the
+        # first requests don't pay for connection setup
         await init_pipeline()
+        app.state.pipeline = pipeline
+        app.state.pdf_executor = create_process_pool()
         logger.info("🚀 Application started")
-
-    @app.on_event("shutdown")
-    async def shutdown():
-        logger.info("🛑 Shutting down application")
-
-    return app
+        try:
+            yield
+        finally:
+            logger.info("🛑 Shutting down application")
+            logger.info(f"📊 Query embedding cache: {query_cache_info()}")
+            if pipeline is not None:
+                await pipeline.close()
+            await shutdown_process_pool(app.state.pdf_executor)
+
+    return create_app(lifespan=lifespan)
 
 
 # ✅ Create app at module level
@@ -0,0 +1,107 @@
+"""Tests for SearchBatcher."""
+import asyncio
+
+from app.embeddings.batcher import SearchBatcher
+
+
+def test_concurrent_searches_share_one_batch():
+    embed_calls = []
+
+    async def embed(texts):
+        embed_calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    async def search(embeddings, limits):
+        return [[{"embedding": e, "limit": limit}] for e, limit in zip(embeddings, limits)]
+
+    async def main():
+        batcher = SearchBatcher(embed, search, max_batch_size=8, max_wait=0.05)
+        try:
+            return await asyncio.gather(*(batcher.search("q" * n, n) for n in range(1, 5)))
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(main())
+
+    assert len(embed_calls) == 1
+    assert results == [[{"embedding": [float(n)], "limit": n}] for n in range(1, 5)]
+
+
+def test_failed_batch_raises_in_every_caller():
+    async def embed(texts):
+        raise ValueError("embedding service down")
+
+    async def search(embeddings, limits):
+        raise AssertionError("search should not run")
+
+    async def main():
+        batcher = SearchBatcher(embed, search, max_wait=0.01)
+        try:
+            return await asyncio.gather(
+                batcher.search("a", 5), batcher.search("b", 5), return_exceptions=True
+            )
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_close_fails_in_flight_and_queued_searches():
+    started = None
+
+    async def embed(texts):
+        started.set()
+        await asyncio.sleep(10)
+
+    async def search(embeddings, limits):
+        raise AssertionError("search should not run")
+
+    async def main():
+        nonlocal started
+        started = asyncio.Event()
+        batcher = SearchBatcher(embed, search, max_batch_size=1, max_wait=0.01)
+        in_flight = asyncio.create_task(batcher.search("a", 5))
+        queued = asyncio.create_task(batcher.search("b", 5))
+        await started.wait()
+        await asyncio.sleep(0)
+        await asyncio.wait_for(batcher.close(), timeout=1)
+        return await asyncio.wait_for(
+            asyncio.gather(in_flight, queued, return_exceptions=True), timeout=1
+        )
+
+    results = asyncio.run(main())
+
+    assert [str(result) for result in results] == ["Search batcher stopped"] * 2
+
+
+def test_embedding_failure_fails_every_waiting_search(monkeypatch):
+    from app.embeddings import base
+
+    class FailingEmbeddings:
+        async def create(self, **kwargs):
+            raise ConnectionError("OpenAI unavailable")
+
+    class FailingClient:
+        embeddings = FailingEmbeddings()
+
+    async def search(embeddings, limits):
+        raise AssertionError("search should not run on random vectors")
+
+    monkeypatch.setattr(base, "_get_async_client", lambda: FailingClient())
+
+    async def main():
+        batcher = SearchBatcher(base.embed_queries, search, max_wait=0.01)
+        try:
+            return await asyncio.gather(
+                batcher.search("uncached query one", 5),
+                batcher.search("uncached query two", 5),
+                return_exceptions=True
+            )
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
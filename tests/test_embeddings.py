@@ -0,0 +1,146 @@
+"""Tests for the embedding model helpers."""
+import asyncio
+
+from app.embeddings.base import BasePgVectorEmbeddingModel
+
+
+class FakeCache:
+    def __init__(self):
+        self.stored = {}
+
+    async def get(self, key):
+        return self.stored.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.stored[key] = value
+
+
+class FailingBatcher:
+    async def search(self, text, params):
+        raise ConnectionError("OpenAI unavailable")
+
+
+def _model_with(cache, batcher):
+    model = BasePgVectorEmbeddingModel.__new__(BasePgVectorEmbeddingModel)
+    model.name = "documents"
+    model.cache = cache
+    model.batcher = batcher
+    model.context_batcher = batcher
+    return model
+
+
+def test_failed_search_is_not_cached():
+    cache = FakeCache()
+    model = _model_with(cache, FailingBatcher())
+
+    results = asyncio.run(model.search("what is pgvector", max_results=3))
+    context = asyncio.run(model.aget_context("what is pgvector", max_results=3))
+
+    assert results == []
+    assert context["count"] == 0
+    assert cache.stored == {}
+
+
+def test_add_items_caps_batches_in_flight():
+    from app.embeddings import base
+
+    running = 0
+    peak = 0
+
+    async def process_batch(items, ingest_mode="online"):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    model = _model_with(None, None)
+    model._process_batch = process_batch
+    items = [base.IndexItem(text=f"chunk {i}") for i in range(100)]
+
+    asyncio.run(model.add_items(items, batch_size=5))
+
+    assert peak == base.INSERT_MAX_IN_FLIGHT
+
+
+def test_legacy_sha256_ids_are_rekeyed_to_content_id():
+    from hashlib import sha256
+
+    from app.embeddings import base
+
+    legacy_text = "stored before the ID change"
+    rows = {
+        sha256(legacy_text.encode()).hexdigest(): legacy_text,
+        # 64 chars but not sha256(text): left alone
+        "f" * 64: "some other ID scheme",
+    }
+    rekeyed = []
+
+    class FakeDb:
+        async def get_ids_and_texts(self, table_name, id_length, after="", limit=1000):
+            return sorted(
+                (row_id, text) for row_id, text in rows.items()
+                if len(row_id) == id_length and row_id > after
+            )[:limit]
+
+        async def rekey_rows(self, table_name, id_pairs):
+            rekeyed.extend(id_pairs)
+            return len(id_pairs)
+
+    model = _model_with(None, None)
+    model.db_client = FakeDb()
+
+    asyncio.run(model._migrate_content_ids())
+
+    assert rekeyed == [(sha256(legacy_text.encode()).hexdigest(), base.content_id(legacy_text))]
+
+
+def test_query_cache_evicts_least_recently_used():
+    from app.embeddings.base import QueryEmbeddingCache
+
+    cache = QueryEmbeddingCache(maxsize=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    assert cache.get("a") == [1.0]  # "b" is now least recently used
+    cache.put("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert cache.get("c") == [3.0]
+    assert cache.cache_info() == {"hits": 3, "misses": 1, "maxsize": 2, "currsize": 2}
+
+
+def test_split_batch_jobs_respects_request_limit(monkeypatch):
+    from app.embeddings import base
+
+    monkeypatch.setattr(base, "BATCH_API_MAX_REQUESTS", 3)
+    items = [base.IndexItem(text=f"chunk {i}") for i in range(7)]
+
+    jobs = base.split_batch_jobs(items)
+
+    assert [len(job) for job in jobs] == [3, 3, 1]
+    assert [item for job in jobs for item in job] == items
+
+
+def test_split_batch_jobs_respects_byte_limit(monkeypatch):
+    from app.embeddings import base
+
+    items = [base.IndexItem(text="x" * 100) for _ in range(4)]
+    line_bytes = len(base._batch_request_line(base.content_id(items[0].text), items[0].text)) + 1
+    monkeypatch.setattr(base, "BATCH_API_MAX_BYTES", line_bytes * 2)
+
+    assert [len(job) for job in base.split_batch_jobs(items)] == [2, 2]
+    assert base.split_batch_jobs([]) == []
+
+
+def test_dedupe_keeps_first_item_per_text():
+    from app.embeddings.base import IndexItem
+
+    model = _model_with(None, None)
+    items = [
+        IndexItem(text="same", meta={"page": 1}),
+        IndexItem(text="other"),
+        IndexItem(text="same", meta={"page": 2}),
+    ]
+
+    assert model._dedupe(items) == [items[0], items[1]]
@@ -0,0 +1,49 @@
+"""Tests for the PostgreSQL client's query building (no database needed)."""
+import numpy as np
+
+from app.db.postgres import PostgresVdbClient, _copy_value, configure_hnsw_params
+
+
+def _client(**kwargs):
+    client = PostgresVdbClient(engine_name="test", **kwargs)
+    client._vector_dims["documents"] = 8
+    return client
+
+
+def test_copy_value_formats_vectors_as_pgvector_literals():
+    assert _copy_value(np.array([0.5, 1.0, -2.25], dtype=np.float32)) == "[0.5,1,-2.25]"
+    assert _copy_value([0.5, 1.0]) == "[0.5,1.0]"
+    assert _copy_value((1, 2)) == "[1,2]"
+    assert _copy_value("text") == "text"
+    assert _copy_value(None) is None
+
+
+def test_hnsw_build_params_grow_with_table_size():
+    assert configure_hnsw_params(10)["m"] < configure_hnsw_params(500_000)["m"] < configure_hnsw_params(2_000_000)["m"]
+    assert "ef_search" not in configure_hnsw_params(10)
+
+
+def test_search_sql_without_quantization_orders_by_cosine_distance():
+    client = _client()
+
+    sql = client._search_sql("documents")
+    params = client._search_params(np.zeros(8, dtype=np.float32), 5, 0.25)
+
+    assert "binary_quantize" not in sql
+    assert "FROM documents" in sql
+    assert params["limit"] == 5
+    assert params["max_distance"] == 0.75
+    assert "candidates" not in params
+
+
+def test_search_sql_with_quantization_reranks_hamming_candidates():
+    client = _client(binary_quantize=True, rerank_candidates=50)
+
+    sql = client._search_sql("documents")
+
+    assert "binary_quantize(embedding)::bit(8) <~>" in sql
+    assert "LIMIT %(candidates)s" in sql
+    assert "embedding <=> %(embedding)s::halfvec" in sql
+    assert client._search_params(np.zeros(8), 5, 0.0)["candidates"] == 50
+    # Never fewer candidates than results asked for
+    assert client._search_params(np.zeros(8), 80, 0.0)["candidates"] == 80
@@ -0,0 +1,47 @@
+"""Tests for PgVectorRetriever's synchronous entry point."""
+import asyncio
+import threading
+
+import pytest
+
+from app.embeddings.base import IndexItem
+from app.rag.retriever import PgVectorRetriever
+
+
+class FakeModel:
+    def __init__(self, loop=None):
+        self.loop = loop
+
+    async def search(self, text, max_results=5):
+        return [IndexItem(text=f"match for {text}", meta={"source": "test"})]
+
+
+def test_invoke_without_a_running_model_loop_points_to_ainvoke():
+    retriever = PgVectorRetriever(embedding_model=FakeModel())
+
+    with pytest.raises(RuntimeError, match="ainvoke"):
+        retriever.invoke("question")
+
+
+def test_invoke_on_the_model_loop_refuses_to_deadlock():
+    async def main():
+        retriever = PgVectorRetriever(embedding_model=FakeModel(asyncio.get_running_loop()))
+        with pytest.raises(RuntimeError, match="block its own event loop"):
+            retriever.invoke("question")
+
+    asyncio.run(main())
+
+
+def test_invoke_from_another_thread_runs_on_the_model_loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        retriever = PgVectorRetriever(embedding_model=FakeModel(loop))
+        docs = retriever.invoke("question")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    assert [doc.page_content for doc in docs] == ["match for question"]